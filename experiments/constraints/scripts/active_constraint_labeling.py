@@ -8,7 +8,7 @@ then label the point with the constraint that has the smallest slack (is tightes
 import argparse
 import json
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 
 import numpy as np
 import pandas as pd
@@ -16,6 +16,8 @@ import matplotlib.pyplot as plt
 from scipy.interpolate import interp1d
 
 
+FloatOrArray = Union[float, np.ndarray]
+
 # Constraint labels
 CONSTRAINT_LABELS = {
     0: 'ATLAS_mu',
@@ -26,7 +28,7 @@ CONSTRAINT_LABELS = {
 }
 
 
-def compute_atlas_mu_slack(alpha: float, lambda_m: float) -> Tuple[float, float]:
+def compute_atlas_mu_slack(alpha: FloatOrArray, lambda_m: FloatOrArray) -> Tuple[FloatOrArray, float]:
     """
     Compute slack to ATLAS μ constraint.
     
@@ -37,12 +39,12 @@ def compute_atlas_mu_slack(alpha: float, lambda_m: float) -> Tuple[float, float]
     Slack = distance to 2σ limit (μ < 1.135 or μ > 0.911)
     
     Args:
-        alpha: Yukawa strength
+        alpha: Yukawa strength (scalar or array)
         lambda_m: Range (m)
     
     Returns:
         (slack, bound) where:
-          slack: Slack (positive if viable, negative if excluded)
+          slack: Slack (positive if viable, negative if excluded), shaped like alpha
           bound: 2σ uncertainty (0.112) for normalization
     """
     # Simplified: μ deviation scales with α
@@ -52,17 +54,16 @@ def compute_atlas_mu_slack(alpha: float, lambda_m: float) -> Tuple[float, float]
     mu_lower = 1.023 - 2 * 0.056  # 2σ lower limit
     bound = 2 * 0.056  # 2σ uncertainty for normalization
     
-    # Slack is distance to nearest violation
-    if mu_deviation > 0:
-        slack = mu_upper - (1.0 + mu_deviation)
-    else:
-        slack = (1.0 + mu_deviation) - mu_lower
+    # Slack is distance to nearest violation ([()] unwraps 0-d results to scalars)
+    slack = np.where(mu_deviation > 0,
+                     mu_upper - (1.0 + mu_deviation),
+                     (1.0 + mu_deviation) - mu_lower)[()]
     
     return slack, bound
 
 
-def compute_higgs_inv_slack(alpha: float, lambda_m: float, m_phi: float, 
-                            br_max: float = 0.145) -> Tuple[float, float]:
+def compute_higgs_inv_slack(alpha: FloatOrArray, lambda_m: FloatOrArray, m_phi: FloatOrArray,
+                            br_max: float = 0.145) -> Tuple[FloatOrArray, float]:
     """
     Compute slack to Higgs invisible width constraint.
     
@@ -73,32 +74,29 @@ def compute_higgs_inv_slack(alpha: float, lambda_m: float, m_phi: float,
     Slack = br_max - BR(H→inv)
     
     Args:
-        alpha: Yukawa strength
+        alpha: Yukawa strength (scalar or array)
         lambda_m: Range (m)
-        m_phi: Scalar mass (GeV) - needed for phase space
+        m_phi: Scalar mass (GeV) - needed for phase space; broadcastable with alpha
         br_max: Maximum allowed BR (default 0.145 conservative, 0.107 tight)
     
     Returns:
         (slack, bound) where:
-          slack: Slack (positive if viable, negative if excluded)
+          slack: Slack (positive if viable, negative if excluded), shaped like alpha
           bound: Maximum allowed BR (for normalization)
     """
     # Simplified: BR scales with α
     # More complete: BR = Γ(H→φφ) / Γ_H_total
-    # For m_φ < m_H/2, phase space is open
-    if m_phi < 62.5:  # m_H/2
-        br_inv = alpha * 0.1  # Rough scaling
-    else:
-        br_inv = 0.0  # Phase space closed
+    # For m_φ < m_H/2 (62.5 GeV), phase space is open; closed above
+    br_inv = np.where(m_phi < 62.5, alpha * 0.1, 0.0)  # Rough scaling
     
     slack = br_max - br_inv
     return slack, br_max
 
 
-def compute_fifth_force_slack(alpha: float, lambda_m: float,
+def compute_fifth_force_slack(alpha: FloatOrArray, lambda_m: FloatOrArray,
                               envelope_data: Optional[pd.DataFrame] = None,
                               alpha_max_allowed: Optional[float] = None,
-                              Theta_lab: float = 1.0) -> Tuple[float, float]:
+                              Theta_lab: float = 1.0) -> Tuple[FloatOrArray, float]:
     """
     Compute slack to fifth-force envelope constraint.
     
@@ -106,16 +104,22 @@ def compute_fifth_force_slack(alpha: float, lambda_m: float,
     Applies screening factor Θ_lab to alpha (for macroscopic experiments).
     Slack = alpha_max_allowed - alpha_eff where alpha_eff = Theta_lab^2 * alpha
     
+    The bound is currently independent of λ: with an envelope, the global
+    minimum excluded α is used rather than interpolating at lambda_m. Because
+    of that, label_constraints_for_grid evaluates this once on whole grids and
+    returns a scalar bound; per-λ interpolation must return a bound shaped like
+    lambda_m (and the normalization there must follow).
+    
     Args:
-        alpha: Yukawa strength (unscreened)
-        lambda_m: Range (m)
+        alpha: Yukawa strength (unscreened, scalar or array)
+        lambda_m: Range (m), broadcastable with alpha (not used yet)
         envelope_data: Optional envelope DataFrame
         alpha_max_allowed: Optional maximum allowed alpha
         Theta_lab: Screening factor for lab experiments (default 1.0 = unscreened)
     
     Returns:
         (slack, bound) where:
-          slack: Slack (positive if viable, negative if excluded)
+          slack: Slack (positive if viable, negative if excluded), shaped like alpha
           bound: Maximum allowed alpha (for normalization)
     """
     # Apply screening: alpha_eff = Theta_lab^2 * alpha
@@ -124,12 +128,11 @@ def compute_fifth_force_slack(alpha: float, lambda_m: float,
     if alpha_max_allowed is not None:
         alpha_max = alpha_max_allowed
     elif envelope_data is not None:
-        # Interpolate envelope at this lambda
+        # Global minimum of the excluded α (most restrictive); λ-independent,
+        # see docstring
         excluded = envelope_data[envelope_data['excluded'] == 1]
         if len(excluded) > 0:
             excluded_sorted = excluded.sort_values('lambda')
-            # Find minimum alpha at this lambda (most restrictive)
-            # Simple: use global minimum for now
             alpha_max = excluded_sorted['alpha'].min()
         else:
             alpha_max = 1e-3  # Default
@@ -140,8 +143,8 @@ def compute_fifth_force_slack(alpha: float, lambda_m: float,
     return slack, alpha_max
 
 
-def compute_qrng_tilt_slack(alpha: float, lambda_m: float,
-                            epsilon_max: float = 0.002292) -> Tuple[float, float]:
+def compute_qrng_tilt_slack(alpha: FloatOrArray, lambda_m: FloatOrArray,
+                            epsilon_max: float = 0.002292) -> Tuple[FloatOrArray, float]:
     """
     Compute slack to QRNG tilt constraint.
     
@@ -154,18 +157,18 @@ def compute_qrng_tilt_slack(alpha: float, lambda_m: float,
     Slack = epsilon_max - |ε|
     
     Args:
-        alpha: Yukawa strength
+        alpha: Yukawa strength (scalar or array)
         lambda_m: Range (m)
         epsilon_max: Maximum allowed tilt (default 0.0008)
     
     Returns:
         (slack, bound) where:
-          slack: Slack (positive if viable, negative if excluded)
+          slack: Slack (positive if viable, negative if excluded), shaped like alpha
           bound: Maximum allowed epsilon (for normalization)
     """
     # Simplified: ε scales with α
     epsilon = alpha * 1e3  # Rough scaling
-    slack = epsilon_max - abs(epsilon)
+    slack = epsilon_max - np.abs(epsilon)
     return slack, epsilon_max
 
 
@@ -182,6 +185,7 @@ def label_constraints_for_grid(lambda_grid: np.ndarray, alpha_grid: np.ndarray,
     
     Uses normalized slack for comparison: normalized_slack = slack / bound
     This allows fair comparison across constraints with different scales.
+    All grids are evaluated as whole arrays (any shape, typically 2D meshgrids).
     
     Args:
         lambda_grid: Lambda values (m)
@@ -196,71 +200,52 @@ def label_constraints_for_grid(lambda_grid: np.ndarray, alpha_grid: np.ndarray,
     
     Returns:
         (constraint_labels, slacks) where:
-          constraint_labels: array of constraint indices (-1=excluded, 0-3=constraint types)
-          slacks: array of (n_points, n_constraints) slack values (raw or normalized based on flag)
+          constraint_labels: int8 array of constraint indices (-1=excluded, 0-3=constraint types)
+          slacks: array of grid.shape + (n_constraints,) slack values (raw or normalized based on flag)
     """
+    lambda_grid = np.asarray(lambda_grid, dtype=float)
+    alpha_grid = np.asarray(alpha_grid, dtype=float)
     shape = lambda_grid.shape
-    n_constraints = 4
-    
-    # Initialize
-    slacks_raw = np.zeros((shape[0], shape[1], n_constraints))
-    slacks_normalized = np.zeros((shape[0], shape[1], n_constraints))
-    bounds = np.zeros((shape[0], shape[1], n_constraints))
-    constraint_labels = np.full(shape, -1, dtype=int)
-    
-    # Compute slacks for each constraint
-    for i in range(shape[0]):
-        for j in range(shape[1]):
-            lam = lambda_grid[i, j]
-            alp = alpha_grid[i, j]
-            
-            # Derive m_phi from lambda if not provided
-            if m_phi_grid is not None:
-                m_phi = m_phi_grid[i, j]
-            else:
-                # λ = ħc / (m_φ c²), so m_φ = ħc / (λ c²)
-                # Using ħc ≈ 197.3e-15 GeV·m
-                m_phi = 197.3e-15 / lam  # GeV
-            
-            # Compute slacks (now return (slack, bound) tuples)
-            # Collider constraints: unscreened (Θ_collider = 1, collisions are microscopic/high-energy)
-            slack_atlas, bound_atlas = compute_atlas_mu_slack(alp, lam)
-            slack_higgs, bound_higgs = compute_higgs_inv_slack(alp, lam, m_phi, br_max=br_max)
-            # Fifth-force: screened (Θ_lab << 1 for macroscopic experiments)
-            slack_ff, bound_ff = compute_fifth_force_slack(alp, lam, envelope_data, alpha_max_allowed, Theta_lab=Theta_lab)
-            slack_qrng, bound_qrng = compute_qrng_tilt_slack(alp, lam, epsilon_max)
-            
-            # Store raw slacks and bounds
-            slacks_raw[i, j, 0] = slack_atlas
-            slacks_raw[i, j, 1] = slack_higgs
-            slacks_raw[i, j, 2] = slack_ff
-            slacks_raw[i, j, 3] = slack_qrng
-            
-            bounds[i, j, 0] = bound_atlas
-            bounds[i, j, 1] = bound_higgs
-            bounds[i, j, 2] = bound_ff
-            bounds[i, j, 3] = bound_qrng
-            
-            # Compute normalized slack: (bound - value) / bound = slack / bound
-            # For constraints where slack = bound - value, normalized_slack = slack / bound
-            slacks_normalized[i, j, 0] = slack_atlas / bound_atlas if bound_atlas > 0 else slack_atlas
-            slacks_normalized[i, j, 1] = slack_higgs / bound_higgs if bound_higgs > 0 else slack_higgs
-            slacks_normalized[i, j, 2] = slack_ff / bound_ff if bound_ff > 0 else slack_ff
-            slacks_normalized[i, j, 3] = slack_qrng / bound_qrng if bound_qrng > 0 else slack_qrng
-            
-            # Use normalized or raw slack for comparison
-            slacks_to_compare = slacks_normalized if use_normalized_slack else slacks_raw
-            
-            # Check if viable (all slacks > 0)
-            if np.all(slacks_to_compare[i, j, :] > 0):
-                # Find tightest constraint (smallest normalized slack)
-                tightest = np.argmin(slacks_to_compare[i, j, :])
-                constraint_labels[i, j] = tightest
-            else:
-                constraint_labels[i, j] = -1  # Excluded
     
-    # Return the slacks that were used for comparison
+    # Derive m_phi from lambda if not provided
+    if m_phi_grid is not None:
+        m_phi_grid = np.asarray(m_phi_grid, dtype=float)
+    else:
+        # λ = ħc / (m_φ c²), so m_φ = ħc / (λ c²)
+        # Using ħc ≈ 197.3e-15 GeV·m
+        with np.errstate(divide='ignore'):
+            m_phi_grid = 197.3e-15 / lambda_grid  # GeV
+    
+    # Each helper evaluates its constraint on the whole grid at once.
+    # Collider constraints: unscreened (Θ_collider = 1, collisions are microscopic/high-energy)
+    slack_atlas, bound_atlas = compute_atlas_mu_slack(alpha_grid, lambda_grid)
+    slack_higgs, bound_higgs = compute_higgs_inv_slack(alpha_grid, lambda_grid, m_phi_grid,
+                                                       br_max=br_max)
+    
+    # Fifth-force: screened (Θ_lab << 1 for macroscopic experiments). The
+    # bound is λ-independent, so one call resolves the envelope for all cells.
+    slack_ff, bound_ff = compute_fifth_force_slack(alpha_grid, lambda_grid, envelope_data,
+                                                   alpha_max_allowed, Theta_lab=Theta_lab)
+    
+    slack_qrng, bound_qrng = compute_qrng_tilt_slack(alpha_grid, lambda_grid, epsilon_max)
+    
+    # Raw slacks stacked as (..., n_constraints)
+    slacks_raw = np.stack([slack_atlas, slack_higgs, slack_ff, slack_qrng], axis=-1)
+    
+    # Compute normalized slack: (bound - value) / bound = slack / bound
+    # (bounds are per-constraint scalars; non-positive bounds leave slack raw)
+    bounds = np.array([bound_atlas, bound_higgs, bound_ff, bound_qrng], dtype=float)
+    slacks_normalized = slacks_raw / np.where(bounds > 0, bounds, 1.0)
+    
+    # Use normalized or raw slack for comparison
     slacks = slacks_normalized if use_normalized_slack else slacks_raw
+    
+    # Viable if all slacks > 0 (NaN counts as excluded); label with the
+    # tightest constraint (smallest slack), -1 otherwise. 5 classes fit int8.
+    viable = np.all(slacks > 0, axis=-1)
+    constraint_labels = np.where(viable, np.argmin(slacks, axis=-1), -1).astype(np.int8)
+    
+    # Return the slacks that were used for comparison
     return constraint_labels, slacks
 
 
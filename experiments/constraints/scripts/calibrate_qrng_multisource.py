@@ -260,8 +260,8 @@ def calibrate_multisource(
         source_result = {
             'source_id': source_id,
             'timestamp_range': {
-                'start': str(data.timestamp.iloc[0]),
-                'end': str(data.timestamp.iloc[-1])
+                'start': str(data.timestamp_start),
+                'end': str(data.timestamp_end)
             },
             'n_trials': len(data.bit),
             'epsilon_max': result['epsilon_max'],
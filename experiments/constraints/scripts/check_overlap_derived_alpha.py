@@ -6,7 +6,9 @@ Instead of scanning (λ, α) directly, scans (m_φ, θ) and derives α and λ.
 This prevents "dial α to zero" escape.
 """
 import argparse
+import copy
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
@@ -27,23 +29,98 @@ from active_constraint_labeling import (
 )
 
 
+@lru_cache(maxsize=None)
+def _parse_json_file(path: str, mtime_ns: int, size: int):
+    """Parse a JSON file; keyed on (path, mtime, size) so edits invalidate it."""
+    return json.loads(Path(path).read_text())
+
+
+def read_json_cached(json_path: Path) -> Dict:
+    """
+    Load a JSON file, reusing the parse while the file is unchanged.
+    
+    Sweeps and robustness checks load the same bounds/calibration files once
+    per scan; the cache is keyed on path, mtime and size so a rewritten file
+    is re-read. Returns a deep copy, so callers may mutate the result.
+    
+    Args:
+        json_path: Path to the JSON file
+    
+    Returns:
+        Parsed JSON content
+    """
+    stat = json_path.stat()
+    data = _parse_json_file(str(json_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    return copy.deepcopy(data)
+
+
 def load_constraint_bounds(qrng_json: Path, ff_json: Path, higgs_json: Path):
     """Load constraint bounds from JSON files."""
     qrng_bounds = None
     if qrng_json.exists():
-        qrng_bounds = json.loads(qrng_json.read_text())
+        qrng_bounds = read_json_cached(qrng_json)
     
     ff_bounds = None
     if ff_json.exists():
-        ff_bounds = json.loads(ff_json.read_text())
+        ff_bounds = read_json_cached(ff_json)
     
     higgs_bounds = None
     if higgs_json.exists():
-        higgs_bounds = json.loads(higgs_json.read_text())
+        higgs_bounds = read_json_cached(higgs_json)
     
     return qrng_bounds, ff_bounds, higgs_bounds
 
 
+def derive_yukawa_grid(
+    m_phi_min: float, m_phi_max: float, n_m_phi: int,
+    theta_min: float, theta_max: float, n_theta: int,
+    model: str = 'simple',
+    rho: float = 0.0,
+    screening: bool = False,
+    Theta: float = 1.0,
+    mu_sb: Optional[float] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the (m_φ, θ) grid and derive the Yukawa (λ, α) at every point.
+    
+    Depends only on the grid and model parameters, not on constraint bounds,
+    so callers scanning several bound sets can derive it once.
+    
+    Returns:
+        (M_PHI_GRID, THETA_GRID, LAMBDA_GRID, ALPHA_GRID), each (n_theta, n_m_phi);
+        points where the mapping fails are NaN
+    """
+    # Create parameter grids
+    m_phi_range = np.logspace(np.log10(m_phi_min), np.log10(m_phi_max), n_m_phi)
+    theta_range = np.logspace(np.log10(theta_min), np.log10(theta_max), n_theta)
+    M_PHI_GRID, THETA_GRID = np.meshgrid(m_phi_range, theta_range)
+    
+    # Derive Yukawa parameters in one vectorized call over the whole grid;
+    # cells where the mapping is undefined come back as NaN
+    try:
+        with np.errstate(invalid='ignore', divide='ignore', over='ignore'):
+            lambda_m, alpha = map_parameters_to_yukawa(
+                M_PHI_GRID, THETA_GRID,
+                rho=rho,
+                model=model,
+                screening=screening,
+                Theta=Theta,
+                mu_sb=mu_sb
+            )
+        LAMBDA_GRID = np.broadcast_to(lambda_m, M_PHI_GRID.shape).astype(float)
+        ALPHA_GRID = np.broadcast_to(alpha, M_PHI_GRID.shape).astype(float)
+    except Exception:
+        # Invalid model parameters (e.g. scale_breaking without mu_sb) fail for
+        # every point alike
+        LAMBDA_GRID = np.full_like(M_PHI_GRID, np.nan)
+        ALPHA_GRID = np.full_like(M_PHI_GRID, np.nan)
+    bad = ~(np.isfinite(LAMBDA_GRID) & np.isfinite(ALPHA_GRID))
+    LAMBDA_GRID[bad] = np.nan
+    ALPHA_GRID[bad] = np.nan
+    
+    return M_PHI_GRID, THETA_GRID, LAMBDA_GRID, ALPHA_GRID
+
+
 def compute_viable_region_derived_alpha(
     m_phi_min: float, m_phi_max: float, n_m_phi: int,
     theta_min: float, theta_max: float, n_theta: int,
@@ -59,7 +136,8 @@ def compute_viable_region_derived_alpha(
     br_max: float = 0.145,  # Maximum allowed BR(H→inv): 0.145 conservative, 0.107 tight
     use_normalized_slack: bool = True,  # Use normalized slack for dominance comparison
     mu_sb: Optional[float] = None,  # Scale breaking mass (GeV, optional). If provided, applies (μ_sb/m_h)^4 suppression. Note: distinct from ATLAS signal strength μ.
-    output_dir: Optional[Path] = None
+    output_dir: Optional[Path] = None,
+    grids: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
 ) -> Dict:
     """
     Compute viable region scanning fundamental parameters (m_φ, θ).
@@ -73,38 +151,18 @@ def compute_viable_region_derived_alpha(
         envelope_data: Envelope DataFrame
         model: 'simple', 'scale_breaking', or 'portal'
         output_dir: Output directory
+        grids: Precomputed derive_yukawa_grid() output for the same grid and
+            model parameters (skips the derivation)
     
     Returns:
         Summary dict with island coordinates and constraint labels
     """
-    # Create parameter grids
-    m_phi_range = np.logspace(np.log10(m_phi_min), np.log10(m_phi_max), n_m_phi)
-    theta_range = np.logspace(np.log10(theta_min), np.log10(theta_max), n_theta)
-    M_PHI_GRID, THETA_GRID = np.meshgrid(m_phi_range, theta_range)
-    
-    # Derive Yukawa parameters
-    LAMBDA_GRID = np.zeros_like(M_PHI_GRID)
-    ALPHA_GRID = np.zeros_like(M_PHI_GRID)
-    
-    for i in range(n_theta):
-        for j in range(n_m_phi):
-            m_phi = M_PHI_GRID[i, j]
-            theta = THETA_GRID[i, j]
-            try:
-                lambda_m, alpha = map_parameters_to_yukawa(
-                    m_phi, theta, 
-                    rho=rho,
-                    model=model,
-                    screening=screening,
-                    Theta=Theta,
-                    mu_sb=mu_sb
-                )
-                LAMBDA_GRID[i, j] = lambda_m
-                ALPHA_GRID[i, j] = alpha
-            except Exception as e:
-                # Handle edge cases (e.g., very small theta causing issues)
-                LAMBDA_GRID[i, j] = np.nan
-                ALPHA_GRID[i, j] = np.nan
+    if grids is None:
+        grids = derive_yukawa_grid(m_phi_min, m_phi_max, n_m_phi,
+                                   theta_min, theta_max, n_theta,
+                                   model=model, rho=rho, screening=screening,
+                                   Theta=Theta, mu_sb=mu_sb)
+    M_PHI_GRID, THETA_GRID, LAMBDA_GRID, ALPHA_GRID = grids
     
     # Get constraint bounds
     alpha_max_allowed = None
@@ -116,9 +174,7 @@ def compute_viable_region_derived_alpha(
     calibration_path = Path('experiments/constraints/results/QRNG_CALIBRATION.json')
     if calibration_path.exists():
         try:
-            import json
-            with open(calibration_path, 'r') as f:
-                calibration = json.load(f)
+            calibration = read_json_cached(calibration_path)
             pooled = calibration.get('pooled', {})
             if 'epsilon_max' in pooled:
                 epsilon_max = pooled['epsilon_max']
@@ -196,12 +252,10 @@ def compute_viable_region_derived_alpha(
         },
     }
     
-    # Constraint dominance
-    constraint_counts = {}
-    for label_idx, label_name in CONSTRAINT_LABELS.items():
-        if label_idx >= 0:
-            count = int(np.sum(viable_labels == label_idx))
-            constraint_counts[label_name] = count
+    # Constraint dominance: one bincount over the viable labels (0..n-1)
+    label_names = [name for idx, name in sorted(CONSTRAINT_LABELS.items()) if idx >= 0]
+    counts = np.bincount(viable_labels, minlength=len(label_names))
+    constraint_counts = {name: int(count) for name, count in zip(label_names, counts)}
     
     total_viable = sum(constraint_counts.values())
     constraint_percentages = {
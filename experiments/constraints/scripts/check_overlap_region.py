@@ -37,14 +37,66 @@ def summarize_island(mask, grids: dict, out_json: str | None = None):
     summary = {"n_viable_points": n}
     for name, grid in grids.items():
         vals = np.asarray(grid)[idx]
+        # One selection pass for all three percentiles (not three sorts)
+        p05, p50, p95 = np.percentile(vals, [5, 50, 95]).tolist()
         summary[name] = {
             "min": float(np.min(vals)),
             "max": float(np.max(vals)),
-            "p50": float(np.percentile(vals, 50)),
-            "p05": float(np.percentile(vals, 5)),
-            "p95": float(np.percentile(vals, 95)),
+            "p50": p50,
+            "p05": p05,
+            "p95": p95,
         }
 
+    return _report_island(summary, out_json)
+
+def repeated_percentile(sorted_vals: np.ndarray, repeats: int, q: float) -> float:
+    """
+    Percentile (numpy 'linear' method) of sorted_vals with every entry repeated
+    `repeats` times, computed without materializing the repeated array.
+    """
+    n_total = len(sorted_vals) * repeats
+    virtual = (q / 100) * (n_total - 1)
+    lo = int(np.floor(virtual))
+    hi = min(lo + 1, n_total - 1)
+    gamma = virtual - lo
+    a = sorted_vals[lo // repeats]
+    b = sorted_vals[hi // repeats]
+    # Same lerp form as np.percentile so results match bit-for-bit
+    if gamma >= 0.5:
+        return float(b - (b - a) * (1 - gamma))
+    return float(a + (b - a) * gamma)
+
+def summarize_separable_island(axes: dict, out_json: str | None = None):
+    """
+    summarize_island for masks that are an outer product of 1D axis masks.
+    
+    Args:
+        axes: dict of name -> (viable_values_1d, repeats), where repeats is the
+              number of viable points along the other axis
+        out_json: optional path to save JSON summary
+    """
+    first_vals, first_repeats = next(iter(axes.values()))
+    n = len(first_vals) * first_repeats
+    if n == 0:
+        print("❌ Overlap/viable region is EMPTY.")
+        return None
+
+    summary = {"n_viable_points": n}
+    for name, (vals, repeats) in axes.items():
+        vals = np.sort(np.asarray(vals))
+        summary[name] = {
+            "min": float(vals[0]),
+            "max": float(vals[-1]),
+            "p50": repeated_percentile(vals, repeats, 50),
+            "p05": repeated_percentile(vals, repeats, 5),
+            "p95": repeated_percentile(vals, repeats, 95),
+        }
+
+    return _report_island(summary, out_json)
+
+def _report_island(summary: dict, out_json: str | None = None):
+    """Print and optionally save an island summary."""
+    n = summary["n_viable_points"]
     print("\n✅ VIABLE ISLAND SUMMARY (bounds)")
     print(f"Viable points: {n}")
     for name, stats in summary.items():
@@ -153,26 +205,22 @@ def compute_viable_region(qrng_bounds: Optional[Dict],
             np.log10(alpha_max),
             n_alpha
         )
-        LAMBDA_GRID, ALPHA_GRID = np.meshgrid(lambda_range, alpha_range)
         
-        # Simple viable mask: points below fifth-force exclusion
+        # Simple viable mask: points below fifth-force exclusion.
+        # alpha_range is sorted (logspace), so the mask ALPHA_GRID < ff_alpha_max
+        # is every lambda paired with alpha_range[:k]; no 2D grid needed.
         ff_alpha_max = ff_bounds.get('alpha_max_allowed', 1e-6) if ff_bounds else 1e-6
-        viable_mask = ALPHA_GRID < ff_alpha_max
+        k = int(np.searchsorted(alpha_range, ff_alpha_max, side='left'))
         
         # Summarize the island
-        island_json_path = None
-        if output_dir:
-            island_json_path = str(output_dir / "overlap_island_summary.json")
-        
         island_json_path = None
         if output_dir:
             island_json_path = str(output_dir / Path(out_json).name)
         
-        island_summary = summarize_island(
-            mask=viable_mask,
-            grids={
-                "lambda_m": LAMBDA_GRID,
-                "alpha": ALPHA_GRID,
+        island_summary = summarize_separable_island(
+            axes={
+                "lambda_m": (lambda_range, k),
+                "alpha": (alpha_range[:k], len(lambda_range)),
             },
             out_json=island_json_path
         )
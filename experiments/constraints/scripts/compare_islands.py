@@ -12,9 +12,18 @@ from pathlib import Path
 import matplotlib.pyplot as plt
 import numpy as np
 
+try:
+    import ijson  # Optional: streaming parser for large summary files
+except ImportError:
+    ijson = None
 
-def load_island_coords(json_path: Path):
-    """Load island coordinates from JSON."""
+# Island fields read by load_island_coords (everything else is skipped)
+_ISLAND_STAT_KEYS = ('lambda_m', 'alpha')
+_JSON_CONTAINER_EVENTS = ('start_map', 'end_map', 'start_array', 'end_array', 'map_key')
+
+
+def _read_island_json(json_path: Path):
+    """Read island section with json.load (fallback when ijson is missing)."""
     with json_path.open('r') as f:
         data = json.load(f)
     
@@ -28,6 +37,59 @@ def load_island_coords(json_path: Path):
             island = data
         else:
             return None
+    return island
+
+
+def _stream_island_json(json_path: Path):
+    """
+    Read island section with ijson, keeping only the fields we compare.
+    
+    Stops as soon as a non-empty island_coordinates block has been parsed, so
+    sample-level arrays later in the file are never decoded.
+    """
+    nested = {}
+    direct = {}
+    has_nested = False
+    has_direct = False
+    
+    with json_path.open('rb') as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == 'island_coordinates':
+                if event == 'map_key':
+                    has_nested = True
+                elif event == 'end_map' and has_nested:
+                    break
+                continue
+            if prefix == '' and event == 'map_key' and value in _ISLAND_STAT_KEYS:
+                has_direct = True
+            if event in _JSON_CONTAINER_EVENTS:
+                continue
+            
+            parts = prefix.split('.')
+            target = direct
+            if parts[0] == 'island_coordinates':
+                target = nested
+                parts = parts[1:]
+            if parts == ['n_viable_points']:
+                target['n_viable_points'] = value
+            elif len(parts) == 2 and parts[0] in _ISLAND_STAT_KEYS:
+                target.setdefault(parts[0], {})[parts[1]] = value
+    
+    if has_nested:
+        return nested
+    if has_direct:
+        return direct
+    return None
+
+
+def load_island_coords(json_path: Path):
+    """Load island coordinates from JSON."""
+    if ijson is not None:
+        island = _stream_island_json(json_path)
+    else:
+        island = _read_island_json(json_path)
+    if island is None:
+        return None
     
     lambda_stats = island.get('lambda_m', {})
     alpha_stats = island.get('alpha', {})
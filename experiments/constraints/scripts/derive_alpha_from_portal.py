@@ -7,7 +7,12 @@ This prevents α from being a free "dial to zero" parameter.
 """
 import argparse
 import numpy as np
-from typing import Tuple, Optional
+from typing import Callable, Dict, Tuple, Optional, Union
+
+try:
+    from numba import njit  # Optional: compiles the scalar α kernel below
+except ImportError:
+    njit = None
 
 
 # Physical constants (CODATA 2018)
@@ -20,39 +25,97 @@ V_H = 246.0  # Higgs vev in GeV
 M_N = 0.938  # Nucleon mass in GeV
 G_NEWTON = 6.674e-11  # Newton's constant in m³/(kg·s²)
 
+# Derived constants, folded once at import
+_MPL_OVER_V = M_PL / V_H  # β_φ / sin θ (Brax & Burrage Eq. 26)
+
+# Scalar or NumPy array (grid) input; derivations broadcast elementwise
+FloatOrArray = Union[float, np.ndarray]
+
+# isinstance is far cheaper than np.ndim on the per-point hot path
+_SCALAR_TYPES = (float, int, np.generic)
+
+# Below this |θ| the scalar kernel uses sin θ ≈ θ(1 - θ²/6); the dropped
+# θ⁵/120 term is < 1e-18 relative, i.e. below float64 rounding
+_SIN_TAYLOR_MAX = 1e-4
+
 
-def derive_lambda_from_mass(m_phi: float, units: str = 'gev') -> float:
+# Unit → GeV conversion factors for derive_lambda_from_mass
+_UNIT_TO_GEV = {
+    'ev': 1e-9,
+    'kev': 1e-6,
+    'mev': 1e-3,
+    'gev': 1.0,
+}
+
+
+def derive_lambda_from_mass(m_phi: FloatOrArray, units: str = 'gev',
+                            _hc: float = HBAR_C_GeV_m,
+                            _table: Dict[str, float] = _UNIT_TO_GEV) -> FloatOrArray:
     """
     Derive Yukawa range λ from scalar mass m_φ using CODATA ħc.
     
     λ = ħc / (m_φ c²) in natural units
     
     Args:
-        m_phi: Scalar mass (in GeV if units='gev', or eV/keV/MeV)
-        units: 'gev', 'ev', 'kev', 'mev'
+        m_phi: Scalar mass (in GeV if units='gev', or eV/keV/MeV); float or array
+        units: 'gev', 'ev', 'kev', 'mev' (case-insensitive)
     
     Returns:
-        λ in meters
+        λ in meters (float for scalar input, array for array input)
     """
-    # Convert to GeV
-    if units == 'ev':
-        m_phi_gev = m_phi * 1e-9
-    elif units == 'kev':
-        m_phi_gev = m_phi * 1e-6
-    elif units == 'mev':
-        m_phi_gev = m_phi * 1e-3
-    elif units == 'gev':
-        m_phi_gev = m_phi
-    else:
-        raise ValueError(f"Unknown units: {units}")
+    # Convert to GeV (constants bound as defaults: local lookups in tight loops)
+    try:
+        to_gev = _table[units]
+    except KeyError:
+        to_gev = _table.get(units.lower())
+        if to_gev is None:
+            raise ValueError(f"Unknown units: {units}") from None
     
-    # λ = ħc / m_φ (CODATA value)
-    lambda_m = HBAR_C_GeV_m / m_phi_gev
+    # λ = ħc / m_φ (CODATA value), one vectorized divide for grids
+    if isinstance(m_phi, _SCALAR_TYPES):
+        return _hc / (m_phi * to_gev)
+    return _hc / (np.asarray(m_phi, dtype=float) * to_gev)
+
+
+def _jit(signature: str):
+    """
+    Compile a scalar kernel with numba (eager signature, disk-cached) when
+    numba is installed; otherwise leave it as plain Python.
+    """
+    def decorate(fn):
+        if njit is None:
+            return fn
+        return njit(signature, cache=True)(fn)
+    return decorate
+
+
+# Scalar kernel for the normalized model. Constants are read as globals,
+# which numba freezes into the compiled code. derive_alpha_normalized routes
+# scalar calls here; array calls use the same formula with NumPy ufuncs.
+# The simple/scale_breaking/portal models are a couple of multiplies, so a
+# numba call (~0.5 µs dispatch) would cost more than the arithmetic itself.
+# On arrays they are already single NumPy ufunc passes: a numba.vectorize
+# ufunc measured 1.3-2.5x slower than the plain expression for 1e3-1e6
+# points (scalar calls ~2.6 µs), so they deliberately stay uncompiled.
+
+@_jit('float64(float64, float64, float64)')
+def _alpha_normalized_kernel(theta, sb_factor, screen_factor):
+    # Brax & Burrage Eq. 26: β_φ / m_Pl = sin θ / v
+    # So: β_φ = (m_Pl / v) sin θ, with a two-term Taylor sin in the
+    # small-angle regime (sweeps use θ ~ 1e-22..1e-18) instead of a libm call
+    if abs(theta) < _SIN_TAYLOR_MAX:
+        sin_theta = theta * (1.0 - theta * theta * (1.0 / 6.0))
+    else:
+        sin_theta = np.sin(theta)
+    beta_phi = _MPL_OVER_V * sin_theta
     
-    return lambda_m
+    # Standard Yukawa: α = 2 β² (Eq. 21 → Eq. 68 in linear regime), times the
+    # scale-breaking suppression and the screening factor Θ² (Eq. 97-98).
+    # Both multipliers are 1.0 when switched off, so the kernel is branch-free.
+    return 2.0 * beta_phi**2 * sb_factor * screen_factor
 
 
-def derive_alpha_simple(theta: float) -> float:
+def derive_alpha_simple(theta: FloatOrArray) -> FloatOrArray:
     """
     Simple α derivation: α = θ² for universal mass-proportional coupling.
     
@@ -68,9 +131,10 @@ def derive_alpha_simple(theta: float) -> float:
     return theta**2
 
 
-def derive_alpha_normalized(theta: float, m_phi: float, 
-                            rho: float = 0.0, screening: bool = False,
-                            Theta: float = 1.0, mu_sb: Optional[float] = None) -> float:
+def derive_alpha_normalized(theta: FloatOrArray, m_phi: FloatOrArray, 
+                            rho: FloatOrArray = 0.0, screening: Union[bool, np.ndarray] = False,
+                            Theta: FloatOrArray = 1.0, mu_sb: Optional[FloatOrArray] = None,
+                            _m_h: float = M_H) -> FloatOrArray:
     """
     Properly normalized α derivation from Brax & Burrage (2021).
     
@@ -83,43 +147,44 @@ def derive_alpha_normalized(theta: float, m_phi: float,
     
     Note: μ_sb (scale-breaking mass) is distinct from ATLAS signal strength μ.
     
+    theta, Theta, mu_sb and screening may be broadcastable arrays (e.g. a
+    (θ, Θ) grid); the result then has their broadcast shape and is computed
+    with NumPy ufuncs in one pass.
+    
     Args:
         theta: Mixing angle (dimensionless)
         m_phi: Scalar mass (in GeV)
-        rho: Matter density (in kg/m³, for screening; default 0 = vacuum)
-        screening: Whether to apply screening suppression
+        rho: Matter density (in kg/m³, for screening; default 0 = vacuum; not yet used)
+        screening: Whether to apply screening suppression (bool or boolean mask)
         Theta: Screening factor (0 < Θ ≤ 1), applied as α_eff = Θ² * α_unscreened
         mu_sb: Scale breaking mass (in GeV, optional). If provided, applies (μ_sb/m_h)^4 suppression.
     
     Returns:
         α (dimensionless Yukawa strength)
     """
-    # Brax & Burrage Eq. 26: β_φ / m_Pl = sin θ / v
-    # So: β_φ = (m_Pl / v) sin θ
-    beta_phi = (M_PL / V_H) * np.sin(theta)
-    
-    # Standard Yukawa: α = 2 β² (Eq. 21 → Eq. 68 in linear regime)
-    alpha_unscreened = 2.0 * beta_phi**2
-    
-    # Scale-breaking suppression (Burrage et al. 2018)
-    # For μ_sb << m_h, tree-level fifth forces are suppressed as (μ_sb/m_h)^4
-    if mu_sb is not None:
-        scale_breaking_suppression = (mu_sb / M_H)**4
-        alpha_unscreened = alpha_unscreened * scale_breaking_suppression
-    
-    # Screening: α_eff = Θ² * α_unscreened (Brax & Burrage Eq. 97-98)
-    # Θ is the screening factor (0 < Θ ≤ 1), computed from paper's expressions
-    # For now, allow user-set Theta; can compute from paper's formulas later
-    if screening:
-        alpha = (Theta**2) * alpha_unscreened
-    else:
-        alpha = alpha_unscreened
+    # Scalar fast path: compiled kernel (numba) or plain Python
+    if (isinstance(theta, _SCALAR_TYPES) and isinstance(Theta, _SCALAR_TYPES)
+            and isinstance(screening, _SCALAR_TYPES)
+            and (mu_sb is None or isinstance(mu_sb, _SCALAR_TYPES))):
+        # Scale-breaking suppression (Burrage et al. 2018)
+        # For μ_sb << m_h, tree-level fifth forces are suppressed as (μ_sb/m_h)^4
+        sb_factor = 1.0 if mu_sb is None else (mu_sb / _m_h)**4
+        # Θ is the screening factor (0 < Θ ≤ 1), computed from paper's expressions
+        # For now, allow user-set Theta; can compute from paper's formulas later
+        screen_factor = Theta**2 if screening else 1.0
+        return _alpha_normalized_kernel(theta, sb_factor, screen_factor)
     
-    return alpha
+    # Array path: same formula on broadcast arrays, screening folded into a
+    # per-element Θ² / 1.0 multiplier. np.sin stays: it is already a
+    # vectorized ufunc, and a Taylor np.where would evaluate both branches.
+    sb_factor = 1.0 if mu_sb is None else (np.asarray(mu_sb, dtype=float) / _m_h)**4
+    screen_factor = np.where(screening, np.asarray(Theta, dtype=float)**2, 1.0)
+    beta_phi = _MPL_OVER_V * np.sin(np.asarray(theta, dtype=float))
+    return 2.0 * beta_phi**2 * sb_factor * screen_factor
 
 
-def derive_alpha_with_scale_breaking(theta: float, mu_sb: float, 
-                                     m_phi: float, m_h: float = M_H) -> float:
+def derive_alpha_with_scale_breaking(theta: FloatOrArray, mu_sb: float, 
+                                     m_phi: FloatOrArray, m_h: float = M_H) -> FloatOrArray:
     """
     α derivation with explicit scale breaking: α = θ² (μ_sb/m_h)².
     
@@ -138,8 +203,8 @@ def derive_alpha_with_scale_breaking(theta: float, mu_sb: float,
     return theta**2 * (mu_sb / m_h)**2
 
 
-def derive_alpha_portal(theta: float, g_Hphi: float, m_phi: float,
-                        m_h: float = M_H, v: float = 246.0) -> float:
+def derive_alpha_portal(theta: FloatOrArray, g_Hphi: float, m_phi: FloatOrArray,
+                        m_h: float = M_H, v: float = 246.0) -> FloatOrArray:
     """
     More complete α derivation including portal coupling.
     
@@ -164,16 +229,66 @@ def derive_alpha_portal(theta: float, g_Hphi: float, m_phi: float,
     return theta**2 * g_Hphi**2
 
 
-def map_parameters_to_yukawa(m_phi: float, theta: float,
+def _alpha_scale_breaking(theta, m_phi, g_Hphi, mu_sb, rho, screening, Theta):
+    if mu_sb is None:
+        raise ValueError("mu_sb required for scale_breaking model")
+    return derive_alpha_with_scale_breaking(theta, mu_sb, m_phi)
+
+
+def _alpha_portal(theta, m_phi, g_Hphi, mu_sb, rho, screening, Theta):
+    if g_Hphi is None:
+        g_Hphi = 1.0  # Default coupling
+    return derive_alpha_portal(theta, g_Hphi, m_phi)
+
+
+# Model name → α derivation. Every entry takes the positional arguments
+# (theta, m_phi, g_Hphi, mu_sb, rho, screening, Theta); positional calls
+# avoid building a kwargs dict per grid point.
+_MODEL_DISPATCH: Dict[str, Callable[..., FloatOrArray]] = {
+    'simple': lambda theta, m_phi, g_Hphi, mu_sb, rho, screening, Theta:
+        derive_alpha_simple(theta),
+    'normalized': lambda theta, m_phi, g_Hphi, mu_sb, rho, screening, Theta:
+        derive_alpha_normalized(theta, m_phi, rho, screening, Theta, mu_sb),
+    'screened': lambda theta, m_phi, g_Hphi, mu_sb, rho, screening, Theta:
+        derive_alpha_normalized(theta, m_phi, rho, True, Theta, mu_sb),
+    'scale_breaking': _alpha_scale_breaking,
+    'portal': _alpha_portal,
+}
+
+
+def resolve_alpha_model(model: str) -> Callable[..., FloatOrArray]:
+    """
+    Look up the α derivation for a model name once.
+    
+    Sweeps that evaluate one model over many points can call the returned
+    function directly with (theta, m_phi, g_Hphi, mu_sb, rho, screening, Theta)
+    instead of going through map_parameters_to_yukawa per point.
+    
+    Args:
+        model: 'simple', 'normalized', 'scale_breaking', 'portal', or 'screened'
+    
+    Returns:
+        α derivation taking the positional arguments above
+    """
+    try:
+        return _MODEL_DISPATCH[model]
+    except KeyError:
+        raise ValueError(f"Unknown model: {model}") from None
+
+
+def map_parameters_to_yukawa(m_phi: FloatOrArray, theta: FloatOrArray,
                              g_Hphi: Optional[float] = None,
                              mu_sb: Optional[float] = None,
                              rho: float = 0.0,
                              model: str = 'simple',
                              screening: bool = False,
-                             Theta: float = 1.0) -> Tuple[float, float]:
+                             Theta: float = 1.0) -> Tuple[FloatOrArray, FloatOrArray]:
     """
     Map fundamental parameters to Yukawa (α, λ).
     
+    m_phi and theta may also be same-shape arrays (e.g. from np.meshgrid), in
+    which case λ and α are returned as arrays evaluated elementwise.
+    
     Args:
         m_phi: Scalar mass (in GeV)
         theta: Mixing angle (dimensionless)
@@ -189,24 +304,11 @@ def map_parameters_to_yukawa(m_phi: float, theta: float,
     """
     # Derive λ from mass using CODATA ħc
     lambda_m = derive_lambda_from_mass(m_phi, units='gev')
+    if not isinstance(theta, _SCALAR_TYPES):
+        theta = np.asarray(theta, dtype=float)
     
-    # Derive α based on model
-    if model == 'simple':
-        alpha = derive_alpha_simple(theta)
-    elif model == 'normalized':
-        alpha = derive_alpha_normalized(theta, m_phi, rho=rho, screening=screening, Theta=Theta, mu_sb=mu_sb)
-    elif model == 'screened':
-        alpha = derive_alpha_normalized(theta, m_phi, rho=rho, screening=True, Theta=Theta, mu_sb=mu_sb)
-    elif model == 'scale_breaking':
-        if mu_sb is None:
-            raise ValueError("mu_sb required for scale_breaking model")
-        alpha = derive_alpha_with_scale_breaking(theta, mu_sb, m_phi)
-    elif model == 'portal':
-        if g_Hphi is None:
-            g_Hphi = 1.0  # Default coupling
-        alpha = derive_alpha_portal(theta, g_Hphi, m_phi)
-    else:
-        raise ValueError(f"Unknown model: {model}")
+    # Derive α based on model (single table lookup, no elif chain)
+    alpha = resolve_alpha_model(model)(theta, m_phi, g_Hphi, mu_sb, rho, screening, Theta)
     
     return lambda_m, alpha
 
@@ -223,7 +325,7 @@ def main():
                    dest='mu_sb',
                    help='Scale breaking mass μ_sb (GeV, for scale_breaking model). Note: distinct from ATLAS signal strength μ.')
     ap.add_argument('--model', type=str, default='simple',
-                   choices=['simple', 'normalized', 'screened', 'scale_breaking', 'portal'],
+                   choices=list(_MODEL_DISPATCH),
                    help='Model type')
     ap.add_argument('--rho', type=float, default=0.0,
                    help='Matter density (kg/m³) for screening')
@@ -6,108 +6,282 @@ Compares envelope alpha vs a specific constraint curve to see which is active.
 If envelope_alpha(λ) < constraint_alpha(λ) everywhere, the constraint cannot tighten.
 """
 import argparse
-import json
+import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
-from scipy.interpolate import interp1d
+# Object-oriented Matplotlib on an explicit Agg canvas: no pyplot import,
+# no GUI backend probing, no global figure state to close
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+from make_global_constraints import write_json
+
+try:
+    # Optional: multithreaded parser for large CSVs + Parquet sidecar cache
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet  # noqa: F401  (engine for DataFrame.to_parquet)
+except ImportError:
+    pacsv = None
+
+
+# Per-point comparison labels used by diagnose_overlap
+LABEL_EQUAL, LABEL_ENVELOPE, LABEL_CONSTRAINT, LABEL_NONE = 0, 1, 2, 3
+LABEL_COLORS = np.array(['gray', 'blue', 'red', 'gray'])
+
+# Only these columns are read from exclusion CSVs (others, e.g. 'source',
+# are skipped by the tokenizer)
+EXCLUSION_COLUMNS = ('lambda', 'alpha', 'excluded')
+EXCLUSION_DTYPES = {'lambda': 'float64', 'alpha': 'float64', 'excluded': 'int8'}
+
+# Files at least this large go through pyarrow (when installed) and get a
+# Parquet sidecar; below it, thread start-up and the sidecar write cost more
+# than pandas' single-threaded parse
+PYARROW_MIN_BYTES = 1 << 20
+
+
+def _read_exclusion_csv_arrow(csv_path: Path) -> pd.DataFrame:
+    """Read the exclusion columns with pyarrow's multithreaded CSV reader."""
+    table = pacsv.read_csv(
+        str(csv_path),
+        read_options=pacsv.ReadOptions(use_threads=True),
+        convert_options=pacsv.ConvertOptions(column_types=EXCLUSION_DTYPES),
+    )
+    return table.select([c for c in EXCLUSION_COLUMNS if c in table.column_names]).to_pandas()
+
+
+def _read_parquet_sidecar(csv_path: Path) -> Optional[pd.DataFrame]:
+    """Return the cached columns if the .parquet sidecar is newer than the CSV."""
+    pq_path = csv_path.with_suffix('.parquet')
+    try:
+        if pq_path.stat().st_mtime < csv_path.stat().st_mtime:
+            return None
+        return pd.read_parquet(pq_path)
+    except (OSError, ValueError):
+        # Missing, unreadable or corrupt sidecar: fall back to the CSV
+        return None
+
+
+def _write_parquet_sidecar(df: pd.DataFrame, csv_path: Path) -> None:
+    """Best-effort write of the parsed columns next to the CSV."""
+    try:
+        df.to_parquet(csv_path.with_suffix('.parquet'), index=False)
+    except OSError:
+        pass  # e.g. read-only data directory; the CSV stays authoritative
 
 
 def load_exclusion_curve(csv_path: Path) -> pd.DataFrame:
-    """Load exclusion curve from CSV."""
-    df = pd.read_csv(csv_path)
+    """
+    Load exclusion curve from CSV.
+    
+    With pyarrow installed, CSVs of at least PYARROW_MIN_BYTES have their
+    parsed columns cached in a .parquet sidecar next to the CSV, reused until
+    the CSV is modified. Smaller curves are re-parsed each time, which is
+    cheaper than writing and reading a sidecar.
+    """
+    csv_path = Path(csv_path)
+    large = pacsv is not None and csv_path.stat().st_size >= PYARROW_MIN_BYTES
+    df = _read_parquet_sidecar(csv_path) if large else None
+    if df is None:
+        if large:
+            df = _read_exclusion_csv_arrow(csv_path)
+            _write_parquet_sidecar(df, csv_path)
+        else:
+            df = pd.read_csv(csv_path, usecols=lambda c: c in EXCLUSION_COLUMNS,
+                             dtype=EXCLUSION_DTYPES)
     # Filter to excluded points only
     if 'excluded' in df.columns:
         df = df[df['excluded'] == 1].copy()
     return df.sort_values('lambda')
 
 
-def get_envelope_at_lambda(envelope_df: pd.DataFrame, lambda_vals: np.ndarray) -> np.ndarray:
+def interp_log_linear(log_x: np.ndarray, log_y: np.ndarray,
+                      log_x_req: np.ndarray) -> np.ndarray:
     """
-    Get envelope alpha values at given lambda values.
+    Piecewise-linear interpolation in log space with linear extrapolation
+    past both ends (same result as interp1d(..., fill_value='extrapolate')).
+    
+    One binary search picks each query's segment; clipping the index to the
+    first/last segment turns the same lerp into the end-slope extrapolation,
+    so no out-of-range masks are needed.
+    """
+    idx = np.clip(np.searchsorted(log_x, log_x_req), 1, len(log_x) - 1)
+    x_lo, x_hi = log_x[idx - 1], log_x[idx]
+    y_lo, y_hi = log_y[idx - 1], log_y[idx]
+    slope = (y_hi - y_lo) / (x_hi - x_lo)
+    return slope * (log_x_req - x_lo) + y_lo
+
+
+def envelope_log_arrays(envelope_df: pd.DataFrame) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Collapse an exclusion DataFrame to the envelope (log10 λ, log10 α) arrays.
     Envelope = minimum alpha (most restrictive) at each lambda.
+    
+    Returns None if fewer than 2 distinct lambda values remain.
     """
-    # Group by lambda and take minimum alpha (most restrictive)
-    envelope_grouped = envelope_df.groupby('lambda')['alpha'].min().reset_index()
-    envelope_grouped = envelope_grouped.sort_values('lambda')
+    lam = envelope_df['lambda'].to_numpy(dtype=float)
+    alpha = envelope_df['alpha'].to_numpy(dtype=float)
+    keep = ~np.isnan(lam)  # groupby drops NaN keys
+    lam, alpha = lam[keep], alpha[keep]
     
-    # Interpolate to requested lambda values
-    if len(envelope_grouped) < 2:
-        return np.full_like(lambda_vals, np.nan)
+    # Group by lambda and take minimum alpha (most restrictive):
+    # sort once, then one segmented reduction over runs of equal lambda.
+    # fmin skips NaN alphas like pandas' min does.
+    order = np.argsort(lam, kind='stable')
+    lam, alpha = lam[order], alpha[order]
+    lambda_unique, starts = np.unique(lam, return_index=True)
+    if len(lambda_unique) < 2:
+        return None
+    alpha_min = np.fmin.reduceat(alpha, starts)
     
     # Use log-space interpolation for better behavior
-    log_lambda = np.log10(envelope_grouped['lambda'].values)
-    log_alpha = np.log10(envelope_grouped['alpha'].values)
-    
-    # Interpolate
-    f = interp1d(log_lambda, log_alpha, kind='linear', 
-                 bounds_error=False, fill_value='extrapolate')
-    
-    log_lambda_req = np.log10(lambda_vals)
-    log_alpha_interp = f(log_lambda_req)
-    alpha_interp = 10**log_alpha_interp
+    log_lambda = np.log10(lambda_unique)
+    log_alpha = np.log10(alpha_min)
+    return log_lambda, log_alpha
+
+
+@lru_cache(maxsize=8)
+def _cached_envelope_log_arrays(path_str: str, mtime: float) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    arrays = envelope_log_arrays(load_exclusion_curve(Path(path_str)))
+    if arrays is not None:
+        # Shared between callers: guard against in-place edits
+        for arr in arrays:
+            arr.flags.writeable = False
+    return arrays
+
+
+def load_envelope_log_arrays(envelope_csv: Path) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    envelope_log_arrays for a CSV, memoized on (path, mtime).
     
-    return alpha_interp
+    Repeated diagnose_overlap calls against the same envelope (batch or
+    notebook use) skip the CSV parse and groupby; editing the file
+    invalidates the entry.
+    """
+    envelope_csv = Path(envelope_csv)
+    return _cached_envelope_log_arrays(str(envelope_csv.resolve()), envelope_csv.stat().st_mtime)
 
 
-def get_constraint_at_lambda(constraint_df: pd.DataFrame, lambda_vals: np.ndarray) -> np.ndarray:
-    """Get constraint alpha values at given lambda values via interpolation."""
+def envelope_log_alpha_at(arrays: Optional[Tuple[np.ndarray, np.ndarray]],
+                          log_lambda_req: np.ndarray) -> np.ndarray:
+    """Interpolate envelope (log10 λ, log10 α) arrays; log10 λ in, log10 α out."""
+    if arrays is None:
+        return np.full_like(log_lambda_req, np.nan)
+    log_lambda, log_alpha = arrays
+    return interp_log_linear(log_lambda, log_alpha, log_lambda_req)
+
+
+def envelope_alpha_at_lambda(arrays: Optional[Tuple[np.ndarray, np.ndarray]],
+                             lambda_vals: np.ndarray) -> np.ndarray:
+    """Interpolate envelope (log10 λ, log10 α) arrays to the given lambda values."""
+    return 10**envelope_log_alpha_at(arrays, np.log10(lambda_vals))
+
+
+def get_envelope_at_lambda(envelope_df: pd.DataFrame, lambda_vals: np.ndarray) -> np.ndarray:
+    """
+    Get envelope alpha values at given lambda values.
+    Envelope = minimum alpha (most restrictive) at each lambda.
+    """
+    return envelope_alpha_at_lambda(envelope_log_arrays(envelope_df), lambda_vals)
+
+
+def constraint_log_alpha_at(constraint_df: pd.DataFrame, log_lambda_req: np.ndarray) -> np.ndarray:
+    """Interpolate a constraint curve in log space; log10 λ in, log10 α out."""
     constraint_sorted = constraint_df.sort_values('lambda')
     
     if len(constraint_sorted) < 2:
-        return np.full_like(lambda_vals, np.nan)
+        return np.full_like(log_lambda_req, np.nan)
     
     # Use log-space interpolation
     log_lambda = np.log10(constraint_sorted['lambda'].values)
     log_alpha = np.log10(constraint_sorted['alpha'].values)
-    
-    f = interp1d(log_lambda, log_alpha, kind='linear',
-                 bounds_error=False, fill_value='extrapolate')
-    
-    log_lambda_req = np.log10(lambda_vals)
-    log_alpha_interp = f(log_lambda_req)
-    alpha_interp = 10**log_alpha_interp
-    
-    return alpha_interp
+    return interp_log_linear(log_lambda, log_alpha, log_lambda_req)
 
 
-def diagnose_overlap(envelope_csv: Path, constraint_csv: Path, 
-                     lambda_min: float, lambda_max: float,
-                     output_path: Path):
-    """
-    Diagnose which constraint is active in the overlap region.
+def get_constraint_at_lambda(constraint_df: pd.DataFrame, lambda_vals: np.ndarray) -> np.ndarray:
+    """Get constraint alpha values at given lambda values via interpolation."""
+    return 10**constraint_log_alpha_at(constraint_df, np.log10(lambda_vals))
+
+
+def compute_overlap(envelope_arrays: Optional[Tuple[np.ndarray, np.ndarray]],
+                    constraint_df: pd.DataFrame,
+                    lambda_min: float, lambda_max: float,
+                    n_points: int = 200) -> dict:
     """
-    # Load curves
-    envelope_df = load_exclusion_curve(envelope_csv)
-    constraint_df = load_exclusion_curve(constraint_csv)
+    Compare envelope vs constraint on a log λ grid (no plotting, no I/O).
     
-    # Create lambda grid in overlap region
-    lambda_vals = np.logspace(np.log10(lambda_min), np.log10(lambda_max), 200)
+    Args:
+        envelope_arrays: (log10 λ, log10 α) from envelope_log_arrays / load_envelope_log_arrays
+        constraint_df: Constraint curve from load_exclusion_curve
+        lambda_min, lambda_max: Comparison range (meters)
+        n_points: Number of λ grid points
     
-    # Get alpha values
-    envelope_alpha = get_envelope_at_lambda(envelope_df, lambda_vals)
-    constraint_alpha = get_constraint_at_lambda(constraint_df, lambda_vals)
+    Returns:
+        Dict with the grid arrays ('lambda_vals', 'envelope_alpha',
+        'constraint_alpha', 'rel_diff', 'labels') and the JSON 'summary'
+    """
+    # Create lambda grid in overlap region, built directly in log space;
+    # linear λ is only needed for the plot axes
+    log_lambda_req = np.linspace(np.log10(lambda_min), np.log10(lambda_max), n_points)
+    lambda_vals = 10**log_lambda_req
+    
+    # Get alpha values (shared log10 λ grid for both curves)
+    envelope_alpha = 10**envelope_log_alpha_at(envelope_arrays, log_lambda_req)
+    constraint_alpha = 10**constraint_log_alpha_at(constraint_df, log_lambda_req)
     
     # Compare: which is more restrictive (lower alpha = tighter constraint)
-    envelope_tighter = envelope_alpha < constraint_alpha
-    constraint_tighter = constraint_alpha < envelope_alpha
-    equal_approx = np.abs(envelope_alpha - constraint_alpha) / np.maximum(envelope_alpha, constraint_alpha) < 0.1
+    # One label per point: within 10% counts as equal; NaN points match nothing
+    rel_diff = np.abs(envelope_alpha - constraint_alpha) / np.maximum(envelope_alpha, constraint_alpha)
+    labels = np.select(
+        [rel_diff < 0.1, envelope_alpha < constraint_alpha, constraint_alpha < envelope_alpha],
+        [LABEL_EQUAL, LABEL_ENVELOPE, LABEL_CONSTRAINT],
+        default=LABEL_NONE
+    ).astype(np.int8)
     
-    # Statistics
-    n_envelope_tighter = np.sum(envelope_tighter & ~equal_approx)
-    n_constraint_tighter = np.sum(constraint_tighter & ~equal_approx)
-    n_equal = np.sum(equal_approx)
+    # Statistics: tolist() hands back Python ints, so the summary needs no
+    # per-field int()/float() casts and the percentages are computed once
+    n_equal, n_envelope_tighter, n_constraint_tighter, _ = np.bincount(labels, minlength=4).tolist()
+    n_pts = len(lambda_vals)
     
-    # Plot
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+    summary = {
+        'lambda_range': [float(lambda_min), float(lambda_max)],
+        'n_points': n_pts,
+        'envelope_tighter_count': n_envelope_tighter,
+        'constraint_tighter_count': n_constraint_tighter,
+        'equal_count': n_equal,
+        'envelope_tighter_pct': 100 * n_envelope_tighter / n_pts,
+        'constraint_tighter_pct': 100 * n_constraint_tighter / n_pts,
+        'conclusion': 'envelope_dominates' if n_envelope_tighter > n_constraint_tighter * 2 else
+                     ('constraint_dominates' if n_constraint_tighter > n_envelope_tighter * 2 else 'mixed')
+    }
+    
+    return {
+        'lambda_vals': lambda_vals,
+        'envelope_alpha': envelope_alpha,
+        'constraint_alpha': constraint_alpha,
+        'rel_diff': rel_diff,
+        'labels': labels,
+        'summary': summary,
+    }
+
+
+def render_overlap(result: dict, output_path: Path, dpi: int = 120):
+    """Plot a compute_overlap result (curves + per-point tighter map)."""
+    lambda_vals = result['lambda_vals']
+    
+    fig = Figure(figsize=(12, 10))
+    FigureCanvasAgg(fig)
+    ax1, ax2 = fig.subplots(2, 1)
     
     # Plot 1: Both curves
-    ax1.loglog(lambda_vals, envelope_alpha, 'b-', linewidth=2, 
+    ax1.loglog(lambda_vals, result['envelope_alpha'], 'b-', linewidth=2, 
               label='Envelope (existing)', alpha=0.7)
-    ax1.loglog(lambda_vals, constraint_alpha, 'r--', linewidth=2,
+    ax1.loglog(lambda_vals, result['constraint_alpha'], 'r--', linewidth=2,
               label='Constraint (new)', alpha=0.7)
     ax1.set_xlabel('Range λ (meters)', fontsize=12)
     ax1.set_ylabel('Yukawa strength α', fontsize=12)
@@ -115,11 +289,15 @@ def diagnose_overlap(envelope_csv: Path, constraint_csv: Path,
     ax1.grid(True, alpha=0.3)
     ax1.legend()
     
-    # Plot 2: Which is tighter
-    colors = np.where(envelope_tighter & ~equal_approx, 'blue',
-                     np.where(constraint_tighter & ~equal_approx, 'red', 'gray'))
-    ax2.scatter(lambda_vals, np.abs(envelope_alpha - constraint_alpha) / np.maximum(envelope_alpha, constraint_alpha),
-               c=colors, alpha=0.6, s=10)
+    # Plot 2: Which is tighter (one marker-only line per category, cheaper
+    # to rasterize than a per-point scatter collection)
+    labels = result['labels']
+    rel_diff = result['rel_diff']
+    for label in (LABEL_EQUAL, LABEL_ENVELOPE, LABEL_CONSTRAINT):
+        mask = labels == label
+        if mask.any():
+            ax2.plot(lambda_vals[mask], rel_diff[mask], 'o', color=LABEL_COLORS[label],
+                     alpha=0.6, markersize=3)
     ax2.set_xscale('log')
     ax2.set_xlabel('Range λ (meters)', fontsize=12)
     ax2.set_ylabel('Relative difference |α_env - α_const| / max(α)', fontsize=10)
@@ -128,10 +306,39 @@ def diagnose_overlap(envelope_csv: Path, constraint_csv: Path,
     ax2.axhline(0.1, color='gray', linestyle=':', alpha=0.5, label='10% threshold')
     ax2.legend()
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=200, bbox_inches='tight')
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=dpi, bbox_inches='tight')
     print(f"✓ Saved diagnostic plot: {output_path}")
-    plt.close()
+
+
+def write_summary_json(summary: dict, json_path: Path) -> None:
+    """Write the summary dict as indented JSON (see make_global_constraints.write_json)."""
+    write_json(json_path, summary)
+
+
+def diagnose_overlap(envelope_csv: Path, constraint_csv: Path, 
+                     lambda_min: float, lambda_max: float,
+                     output_path: Path, plot: bool = True, dpi: int = 120) -> dict:
+    """
+    Diagnose which constraint is active in the overlap region.
+    
+    Writes the JSON summary next to output_path; the PNG is only rendered
+    when plot=True (rendering dominates runtime for batch diagnoses).
+    """
+    # Load curves (envelope arrays are cached across calls)
+    envelope_arrays = load_envelope_log_arrays(envelope_csv)
+    constraint_df = load_exclusion_curve(constraint_csv)
+    
+    result = compute_overlap(envelope_arrays, constraint_df, lambda_min, lambda_max)
+    summary = result['summary']
+    n_points = summary['n_points']
+    n_envelope_tighter = summary['envelope_tighter_count']
+    n_constraint_tighter = summary['constraint_tighter_count']
+    n_equal = summary['equal_count']
+    
+    # Plot
+    if plot:
+        render_overlap(result, output_path, dpi=dpi)
     
     # Print summary
     print("\n" + "="*60)
@@ -140,15 +347,15 @@ def diagnose_overlap(envelope_csv: Path, constraint_csv: Path,
     print(f"Lambda range: {lambda_min:.2e} to {lambda_max:.2e} m")
     print(f"  ({lambda_min*1e6:.1f} to {lambda_max*1e6:.1f} µm)")
     print()
-    print(f"Envelope tighter: {n_envelope_tighter} / {len(lambda_vals)} points ({100*n_envelope_tighter/len(lambda_vals):.1f}%)")
-    print(f"Constraint tighter: {n_constraint_tighter} / {len(lambda_vals)} points ({100*n_constraint_tighter/len(lambda_vals):.1f}%)")
-    print(f"Approximately equal: {n_equal} / {len(lambda_vals)} points ({100*n_equal/len(lambda_vals):.1f}%)")
+    print(f"Envelope tighter: {n_envelope_tighter} / {n_points} points ({summary['envelope_tighter_pct']:.1f}%)")
+    print(f"Constraint tighter: {n_constraint_tighter} / {n_points} points ({summary['constraint_tighter_pct']:.1f}%)")
+    print(f"Approximately equal: {n_equal} / {n_points} points ({100*n_equal/n_points:.1f}%)")
     print()
     
-    if n_envelope_tighter > n_constraint_tighter * 2:
+    if summary['conclusion'] == 'envelope_dominates':
         print("→ CONCLUSION: Envelope dominates. Constraint cannot tighten island.")
         print("  The constraint is redundant in this region.")
-    elif n_constraint_tighter > n_envelope_tighter * 2:
+    elif summary['conclusion'] == 'constraint_dominates':
         print("→ CONCLUSION: Constraint dominates. Island may not be living in this region.")
         print("  The constraint is stronger, but island percentiles didn't change.")
     else:
@@ -156,21 +363,11 @@ def diagnose_overlap(envelope_csv: Path, constraint_csv: Path,
         print("  Both constraints are active in different parts of the range.")
     
     # Save JSON summary
-    summary = {
-        'lambda_range': [float(lambda_min), float(lambda_max)],
-        'n_points': len(lambda_vals),
-        'envelope_tighter_count': int(n_envelope_tighter),
-        'constraint_tighter_count': int(n_constraint_tighter),
-        'equal_count': int(n_equal),
-        'envelope_tighter_pct': float(100 * n_envelope_tighter / len(lambda_vals)),
-        'constraint_tighter_pct': float(100 * n_constraint_tighter / len(lambda_vals)),
-        'conclusion': 'envelope_dominates' if n_envelope_tighter > n_constraint_tighter * 2 else
-                     ('constraint_dominates' if n_constraint_tighter > n_envelope_tighter * 2 else 'mixed')
-    }
-    
     json_path = output_path.with_suffix('.json')
-    json_path.write_text(json.dumps(summary, indent=2))
+    write_summary_json(summary, json_path)
     print(f"✓ Saved summary: {json_path}")
+    
+    return summary
 
 
 def main():
@@ -186,7 +383,11 @@ def main():
                    help='Maximum lambda for comparison (meters)')
     ap.add_argument('--out', type=str,
                    default='experiments/constraints/results/constraint_diagnostic.png',
-                   help='Output plot path')
+                   help='Output plot path (JSON summary is written alongside)')
+    ap.add_argument('--no-plot', dest='plot', action='store_false',
+                   help='Skip the PNG and only write the JSON summary (fast, headless)')
+    ap.add_argument('--dpi', type=int, default=120,
+                   help='PNG resolution (default 120; use 200 for publication figures)')
     args = ap.parse_args()
     
     envelope_path = Path(args.envelope)
@@ -204,13 +405,12 @@ def main():
     
     diagnose_overlap(envelope_path, constraint_path,
                     args.lambda_min, args.lambda_max,
-                    output_path)
+                    output_path, plot=args.plot, dpi=args.dpi)
     
     print("\nDone.")
     return 0
 
 
 if __name__ == '__main__':
-    import sys
     sys.exit(main())
 
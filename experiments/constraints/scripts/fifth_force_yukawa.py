@@ -9,14 +9,22 @@ Maps mediator parameters (m_M, g_M) → Yukawa (λ, α) where:
 Reads exclusion curves from data files and produces allowed/excluded regions.
 """
 import argparse
-import json
+import sys
 from pathlib import Path
 from typing import Tuple, Optional
 
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from matplotlib.patches import Rectangle
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+from make_global_constraints import write_json
+
+
+# Let Agg simplify and chunk long paths when digitized curves get large
+plt.rcParams.update({'path.simplify': True, 'path.simplify_threshold': 1.0,
+                     'agg.path.chunksize': 10000})
 
 def load_exclusion_data(csv_path: Path) -> pd.DataFrame:
     """
@@ -27,6 +35,8 @@ def load_exclusion_data(csv_path: Path) -> pd.DataFrame:
         # Create a placeholder with typical Eötvös/EP test bounds
         # These are conservative estimates - replace with real digitized data
         print(f"Warning: {csv_path} not found. Creating placeholder data.")
+        # A 1-D curve of paired (λ, α) samples, like the digitized curves
+        # (plot_constraints draws it with fill_between), not a 2-D grid
         lambda_vals = np.logspace(-6, 0, 100)  # 1 micron to 1 meter
         alpha_vals = np.logspace(-12, -3, 100)  # Typical EP test sensitivity
         # Simple exclusion: alpha > 10^-6 for lambda > 10^-4
@@ -34,12 +44,15 @@ def load_exclusion_data(csv_path: Path) -> pd.DataFrame:
         df = pd.DataFrame({
             'lambda': lambda_vals,
             'alpha': alpha_vals,
-            'excluded': excluded.astype(int)
+            'excluded': excluded.astype(np.int8)
         })
         df.to_csv(csv_path, index=False)
         print(f"Created placeholder: {csv_path}")
     
-    df = pd.read_csv(csv_path)
+    # Only the curve columns, with fixed float dtypes (no per-column inference);
+    # 'excluded' keeps inference since it may be bool or 1/0
+    df = pd.read_csv(csv_path, usecols=lambda c: c in ('lambda', 'alpha', 'excluded'),
+                     dtype={'lambda': np.float64, 'alpha': np.float64}, engine='c')
     return df
 
 def mediator_to_yukawa(m_M: float, g_M: float, matter_coupling: float = 1.0) -> Tuple[float, float]:
@@ -67,15 +80,23 @@ def plot_constraints(df: pd.DataFrame, output_path: Path,
     """
     fig, ax = plt.subplots(figsize=(10, 7))
     
+    # Flag masks computed once and reused for the plot and the bounds JSON
+    flags = df['excluded'].to_numpy()
+    is_excluded = flags == 1
+    is_allowed = flags == 0
+    
     # Plot exclusion curve
-    excluded = df[df['excluded'] == 1]
+    excluded = df[is_excluded]
     if len(excluded) > 0:
-        ax.fill_between(excluded['lambda'], excluded['alpha'], 
-                       excluded['alpha'].max() * 10,
-                       alpha=0.3, color='red', label='Excluded (EP tests)')
+        lam = excluded['lambda'].to_numpy()
+        alpha = excluded['alpha'].to_numpy()
+        # Digitized and placeholder curves all vary in α, so there is no
+        # constant-α (rectangle) special case; fill_between handles both
+        ax.fill_between(lam, alpha, alpha.max() * 10,
+                        alpha=0.3, color='red', label='Excluded (EP tests)')
     
     # Plot allowed region boundary
-    allowed = df[df['excluded'] == 0]
+    allowed = df[is_allowed]
     if len(allowed) > 0:
         ax.plot(allowed['lambda'], allowed['alpha'], 
                'b-', linewidth=2, label='Current bound')
@@ -106,11 +127,11 @@ def plot_constraints(df: pd.DataFrame, output_path: Path,
     bounds_json = {
         'lambda_min': float(df['lambda'].min()),
         'lambda_max': float(df['lambda'].max()),
-        'alpha_max_allowed': float(df[df['excluded'] == 0]['alpha'].max() if len(df[df['excluded'] == 0]) > 0 else df['alpha'].max()),
-        'exclusion_points': len(excluded)
+        'alpha_max_allowed': float(allowed['alpha'].max() if len(allowed) > 0 else df['alpha'].max()),
+        'exclusion_points': int(is_excluded.sum())
     }
     json_path = output_path.with_suffix('.json')
-    json_path.write_text(json.dumps(bounds_json, indent=2))
+    write_json(json_path, bounds_json)
     print(f"✓ Saved bounds: {json_path}")
 
 def main():
@@ -9,11 +9,18 @@ Conservative approach: accepts externally provided limit numbers/curves.
 """
 import argparse
 import json
+import sys
 from pathlib import Path
 from typing import Dict, Optional
 
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.colors import ListedColormap
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+from make_global_constraints import write_json
+
 
 def load_higgs_limits(config_path: Path) -> Dict:
     """
@@ -49,28 +56,27 @@ def compute_excluded_region(limits: Dict, m_phi_range: np.ndarray,
     
     Simple model: exclusion if invisible width exceeds limit OR
     signal strength deviation exceeds limit.
+    
+    Returns a boolean array of shape (len(m_phi_range), len(g_phiH_range)).
     """
     M_H = 125.0  # Higgs mass (GeV)
     Gamma_H_SM = 4.1  # SM Higgs width (MeV)
     
-    excluded = np.zeros((len(m_phi_range), len(g_phiH_range)), dtype=bool)
-    
-    for i, m_phi in enumerate(m_phi_range):
-        for j, g_phiH in enumerate(g_phiH_range):
-            # Simple invisible width estimate (tree-level, simplified)
-            if m_phi < M_H / 2:
-                # Higgs can decay to Phi pairs
-                # Rough estimate: Gamma_inv ~ g_phiH^2 * M_H^3 / (8*pi*m_phi^2)
-                # (This is a placeholder - real calculation needs full model)
-                gamma_inv_est = (g_phiH**2 * M_H**3) / (8 * np.pi * m_phi**2) * 1e-3  # Convert to MeV
-                if gamma_inv_est > limits.get('invisible_width_limit', 0.1):
-                    excluded[i, j] = True
-            
-            # Signal strength deviation (simplified)
-            # Rough estimate: deviation ~ g_phiH^2 * (some function of m_phi)
-            deviation_est = g_phiH**2 * (M_H / m_phi)**2 * 1e-3
-            if deviation_est > limits.get('signal_strength_deviation', 0.05):
-                excluded[i, j] = True
+    # Broadcast over the grid: rows are m_Phi, columns are g_PhiH
+    m_phi = np.asarray(m_phi_range, dtype=float)[:, None]
+    g_phiH = np.asarray(g_phiH_range, dtype=float)[None, :]
+    
+    # Simple invisible width estimate (tree-level, simplified)
+    # Higgs can decay to Phi pairs only if m_phi < M_H / 2
+    # Rough estimate: Gamma_inv ~ g_phiH^2 * M_H^3 / (8*pi*m_phi^2)
+    # (This is a placeholder - real calculation needs full model)
+    gamma_inv_est = (g_phiH**2 * M_H**3) / (8 * np.pi * m_phi**2) * 1e-3  # Convert to MeV
+    invisible_excluded = (m_phi < M_H / 2) & (gamma_inv_est > limits.get('invisible_width_limit', 0.1))
+    
+    # Signal strength deviation (simplified)
+    # Rough estimate: deviation ~ g_phiH^2 * (some function of m_phi)
+    deviation_est = g_phiH**2 * (M_H / m_phi)**2 * 1e-3
+    excluded = invisible_excluded | (deviation_est > limits.get('signal_strength_deviation', 0.05))
     
     return excluded
 
@@ -84,37 +90,40 @@ def plot_higgs_bounds(limits: Dict, output_path: Path):
     m_phi_vals = np.logspace(np.log10(m_phi_min), np.log10(m_phi_max), 100)
     g_phiH_vals = np.logspace(np.log10(g_min), np.log10(g_max), 100)
     
-    M_phi, G_phiH = np.meshgrid(m_phi_vals, g_phiH_vals)
-    
     excluded = compute_excluded_region(limits, m_phi_vals, g_phiH_vals)
     
     fig, ax = plt.subplots(figsize=(10, 7))
     
-    # Plot excluded region
-    ax.contourf(M_phi, G_phiH, excluded.T, levels=[0.5, 1.5], 
-               colors=['red'], alpha=0.3, label='Excluded (LHC bounds)')
+    # Plot excluded region: the binary mask is drawn directly as cells
+    # (contour tracing a 0/1 field only produces per-cell polygons);
+    # allowed cells are masked out so they stay transparent
+    ax.pcolormesh(m_phi_vals, g_phiH_vals, np.ma.masked_equal(excluded.T.astype(np.float32), 0),
+                  cmap=ListedColormap(['red']), alpha=0.3, shading='nearest',
+                  label='Excluded (LHC bounds)')
     
     # Plot boundary
-    # Find boundary curve (simplified)
-    boundary_m = []
-    boundary_g = []
-    for i, m in enumerate(m_phi_vals):
-        for j, g in enumerate(g_phiH_vals):
-            if excluded[i, j] and (i == 0 or not excluded[i-1, j]):
-                boundary_m.append(m)
-                boundary_g.append(g)
-                break
-    
-    if boundary_m:
+    # Find boundary curve (simplified): for each mass, the first coupling that
+    # is excluded here but not at the previous mass
+    edge = excluded.copy()
+    edge[1:] &= ~excluded[:-1]
+    has_edge = edge.any(axis=1)
+    boundary_m = m_phi_vals[has_edge]
+    boundary_g = g_phiH_vals[edge.argmax(axis=1)[has_edge]]
+    
+    if boundary_m.size:
         ax.plot(boundary_m, boundary_g, 'r-', linewidth=2, label='Current bound')
     
     ax.set_xscale('log')
     ax.set_yscale('log')
+    # Cells are centred on grid nodes; keep the frame at the grid range
+    ax.set_xlim(m_phi_vals[0], m_phi_vals[-1])
+    ax.set_ylim(g_phiH_vals[0], g_phiH_vals[-1])
     ax.set_xlabel('Scalar mass m_Φ (GeV)', fontsize=12)
     ax.set_ylabel('Higgs-portal coupling g_ΦH', fontsize=12)
     ax.set_title('Higgs Portal Constraints\nCollider/Invisible-Width Bounds', fontsize=14)
     ax.grid(True, alpha=0.3)
-    ax.legend()
+    # Fixed corner: loc='best' would hit-test every mesh cell
+    ax.legend(loc='upper right')
     
     plt.tight_layout()
     plt.savefig(output_path, dpi=200, bbox_inches='tight')
@@ -129,7 +138,7 @@ def plot_higgs_bounds(limits: Dict, output_path: Path):
         'signal_strength_deviation': limits.get('signal_strength_deviation', 0.05)
     }
     json_path = output_path.with_suffix('.json')
-    json_path.write_text(json.dumps(bounds_json, indent=2))
+    write_json(json_path, bounds_json)
     print(f"✓ Saved bounds: {json_path}")
 
 def main():
@@ -6,135 +6,156 @@ Perturbs each digitized curve by ±10% in log α (Gaussian noise),
 reruns overlap analysis multiple times, and reports survival statistics.
 """
 import argparse
-import json
-import random
+import sys
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Optional
 
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from scipy import stats
+
+
+# Let Agg simplify and chunk long paths when digitized curves get large
+plt.rcParams.update({'path.simplify': True, 'path.simplify_threshold': 1.0,
+                     'agg.path.chunksize': 10000})
+
+sys.path.insert(0, str(Path(__file__).parent))
+from check_overlap_region import repeated_percentile
+from make_global_constraints import write_json
+
+# Order of the per-run statistics collected by run_jitter_robustness_test
+STAT_KEYS = (
+    ('lambda_m', 'p05'), ('lambda_m', 'p50'), ('lambda_m', 'p95'),
+    ('alpha', 'p05'), ('alpha', 'p50'), ('alpha', 'p95'),
+)
 
 
 def load_envelope(csv_path: Path) -> pd.DataFrame:
-    """Load envelope CSV."""
-    return pd.read_csv(csv_path)
+    """Load envelope CSV (curve columns only, fixed dtypes)."""
+    return pd.read_csv(csv_path, usecols=['lambda', 'alpha', 'excluded'],
+                       dtype={'lambda': np.float64, 'alpha': np.float64, 'excluded': np.int8},
+                       engine='c')
 
 
-def jitter_curve(df: pd.DataFrame, sigma: float = 0.1) -> pd.DataFrame:
+def jitter_alpha(alpha: np.ndarray, sigma: float = 0.1,
+                 rng: Optional[np.random.Generator] = None) -> np.ndarray:
     """
     Add Gaussian noise to log alpha values.
     
+    Works on the α column alone (λ and the excluded flags are unchanged by
+    the jitter), so no DataFrame copy is made.
+    
     Args:
-        df: DataFrame with 'alpha' column
+        alpha: Curve α values
         sigma: Standard deviation in log10 space (default 0.1 = 10% relative)
+        rng: NumPy Generator to draw from (default: a fresh default_rng())
     
     Returns:
-        Jittered DataFrame
+        Jittered α array
     """
-    df_jittered = df.copy()
+    if rng is None:
+        rng = np.random.default_rng()
     
     # Add Gaussian noise in log space
-    log_alpha = np.log10(df_jittered['alpha'].values)
-    noise = np.random.normal(0, sigma, size=len(log_alpha))
-    log_alpha_jittered = log_alpha + noise
+    log_alpha = np.log10(alpha)
+    noise = rng.normal(0, sigma, size=len(log_alpha))
     
-    # Convert back to linear space
-    df_jittered['alpha'] = 10**log_alpha_jittered
+    # Convert back to linear space, ensuring alpha stays positive
+    return np.maximum(10**(log_alpha + noise), 1e-20)
+
+
+def jitter_alpha_max_allowed(envelope_df: pd.DataFrame, n_runs: int,
+                             sigma: float = 0.1,
+                             rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Fifth-force bound for n_runs independent jitters of the envelope, as one batch.
     
-    # Ensure alpha stays positive
-    df_jittered['alpha'] = np.maximum(df_jittered['alpha'], 1e-20)
+    Each run applies jitter_alpha's log-space Gaussian noise to every row and
+    takes the minimum jittered α over the excluded rows. Noise is drawn from
+    rng as a single (n_runs, n_rows) matrix, i.e. the same stream as n_runs
+    successive jitter_alpha calls sharing that Generator.
     
-    return df_jittered
+    Returns:
+        α_max_allowed per run (NaN for every run if no row is excluded)
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    # log10 of the envelope is shared by all runs: computed once per batch
+    log_alpha = np.log10(envelope_df['alpha'].values)
+    noise = rng.normal(0, sigma, size=(n_runs, len(log_alpha)))
+    
+    excluded = envelope_df['excluded'].values == 1
+    if not excluded.any():
+        return np.full(n_runs, np.nan)
+    
+    # Jitter in place (no second n_runs × n_rows array); rows that are not
+    # excluded are pushed to +inf so they never win the minimum
+    log_alpha_jittered = noise
+    log_alpha_jittered += log_alpha
+    log_alpha_jittered[:, ~excluded] = np.inf
+    
+    # 10**x is monotonic, so the min is taken in log space and exponentiated
+    # once per run (same value as min(10**x), without n_runs × n_rows powers);
+    # then ensure alpha stays positive (as in jitter_alpha)
+    log_alpha_min = log_alpha_jittered.min(axis=1)
+    return np.maximum(10**log_alpha_min, 1e-20)
 
 
-def run_single_jitter_test(envelope_path: Path, qrng_json: Path, 
-                           ff_json: Path, higgs_json: Path,
-                           lambda_min: float, lambda_max: float,
-                           alpha_min: float, alpha_max: float,
-                           n_lambda: int, n_alpha: int) -> Dict:
+def island_percentiles(lambda_range: np.ndarray, alpha_range: np.ndarray,
+                       alpha_max_allowed: float) -> Optional[Dict]:
     """
-    Run a single jittered overlap test.
+    Island summary for the simplified viable mask ALPHA_GRID < alpha_max_allowed.
+    
+    The mask keeps the first k α rows of the (λ, α) grid for every λ, so the
+    percentiles are taken over each axis with repeats, without building the
+    grid (same values as np.percentile on the masked meshgrid).
+    
+    Args:
+        lambda_range, alpha_range: Ascending grid axes
+        alpha_max_allowed: Fifth-force bound for this run
     
     Returns dict with island summary or None if empty.
     """
-    # Load and jitter envelope
-    envelope_df = load_envelope(envelope_path)
-    envelope_jittered = jitter_curve(envelope_df, sigma=0.1)
-    
-    # Save temporary jittered envelope
-    temp_path = envelope_path.parent / 'temp_jittered_envelope.csv'
-    envelope_jittered.to_csv(temp_path, index=False)
-    
-    # Update bounds JSON from jittered envelope
-    excluded = envelope_jittered[envelope_jittered['excluded'] == 1]
-    if len(excluded) > 0:
-        alpha_max_allowed = excluded['alpha'].min()
-        bounds = {
-            'alpha_max_allowed': float(alpha_max_allowed)
-        }
-        temp_bounds = ff_json.parent / 'temp_jittered_bounds.json'
-        temp_bounds.write_text(json.dumps(bounds))
-    else:
+    if np.isnan(alpha_max_allowed):
         return None
-    
-    # Run overlap check (simplified - just check if viable region exists)
-    # For full implementation, would call check_overlap_region.py
-    # Here we do a simplified check
-    
-    # Create parameter grid
-    lambda_range = np.logspace(np.log10(lambda_min), np.log10(lambda_max), n_lambda)
-    alpha_range = np.logspace(np.log10(alpha_min), np.log10(alpha_max), n_alpha)
-    LAMBDA_GRID, ALPHA_GRID = np.meshgrid(lambda_range, alpha_range)
-    
-    # Simple viable mask: points below fifth-force exclusion
-    viable_mask = ALPHA_GRID < alpha_max_allowed
-    
-    n_viable = int(viable_mask.sum())
-    
-    if n_viable == 0:
+    k = int(np.searchsorted(alpha_range, alpha_max_allowed, side='left'))
+    if k == 0:
         return None
     
-    # Compute percentiles
-    viable_lambda = LAMBDA_GRID[viable_mask]
-    viable_alpha = ALPHA_GRID[viable_mask]
+    n_lambda = len(lambda_range)
+    viable_alpha = alpha_range[:k]
     
     result = {
-        'n_viable_points': n_viable,
+        'n_viable_points': k * n_lambda,
         'lambda_m': {
-            'p05': float(np.percentile(viable_lambda, 5)),
-            'p50': float(np.percentile(viable_lambda, 50)),
-            'p95': float(np.percentile(viable_lambda, 95)),
+            'p05': repeated_percentile(lambda_range, k, 5),
+            'p50': repeated_percentile(lambda_range, k, 50),
+            'p95': repeated_percentile(lambda_range, k, 95),
         },
         'alpha': {
-            'p05': float(np.percentile(viable_alpha, 5)),
-            'p50': float(np.percentile(viable_alpha, 50)),
-            'p95': float(np.percentile(viable_alpha, 95)),
+            'p05': repeated_percentile(viable_alpha, n_lambda, 5),
+            'p50': repeated_percentile(viable_alpha, n_lambda, 50),
+            'p95': repeated_percentile(viable_alpha, n_lambda, 95),
         }
     }
     
-    # Cleanup
-    temp_path.unlink(missing_ok=True)
-    temp_bounds.unlink(missing_ok=True)
-    
     return result
 
 
 def run_jitter_robustness_test(envelope_path: Path, n_runs: int = 200,
-                               output_dir: Path = None):
+                               output_dir: Path = None, seed: Optional[int] = None,
+                               dpi: int = 120):
     """
     Run multiple jitter tests and collect statistics.
+    
+    All runs draw from one np.random.Generator (PCG64) seeded with `seed`
+    (None = fresh OS entropy), so a fixed seed reproduces the summary.
+    The histogram PNG is written at `dpi` (120 by default; 200 for print).
     """
     if output_dir is None:
         output_dir = Path('experiments/constraints/results')
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Load reference bounds
-    qrng_json = Path('experiments/grok_qrng/results/lfdr_withinrun/global_summary.json')
-    ff_json = Path('experiments/constraints/results/fifth_force_bounds.json')
-    higgs_json = Path('experiments/constraints/results/higgs_portal_bounds.json')
-    
     # Use same zoom bounds as previous runs
     lambda_min = 3.717e-06
     lambda_max = 2.693e-01
@@ -148,21 +169,27 @@ def run_jitter_robustness_test(envelope_path: Path, n_runs: int = 200,
     print(f"  Lambda range: {lambda_min:.2e} to {lambda_max:.2e} m")
     print(f"  Alpha range: {alpha_min:.2e} to {alpha_max:.2e}")
     
-    results = []
-    for i in range(n_runs):
-        if (i + 1) % 20 == 0:
-            print(f"  Progress: {i+1}/{n_runs} runs...")
-        
-        result = run_single_jitter_test(
-            envelope_path, qrng_json, ff_json, higgs_json,
-            lambda_min, lambda_max, alpha_min, alpha_max,
-            n_lambda, n_alpha
-        )
-        
+    # Envelope and parameter axes do not depend on the jitter
+    envelope_df = load_envelope(envelope_path)
+    lambda_range = np.logspace(np.log10(lambda_min), np.log10(lambda_max), n_lambda)
+    alpha_range = np.logspace(np.log10(alpha_min), np.log10(alpha_max), n_alpha)
+    
+    # Run overlap check (simplified - just check if viable region exists)
+    # For full implementation, would call check_overlap_region.py
+    # Here we do a simplified check: points below the jittered fifth-force bound
+    rng = np.random.default_rng(seed)
+    alpha_bounds = jitter_alpha_max_allowed(envelope_df, n_runs, sigma=0.1, rng=rng)
+    # Per-run percentiles, one row per statistic (see STAT_KEYS); each row
+    # is contiguous, so the reductions below sum it pairwise like np.mean
+    stats_arr = np.full((len(STAT_KEYS), n_runs), np.nan)
+    survived = np.zeros(n_runs, dtype=bool)
+    for i, alpha_max_allowed in enumerate(alpha_bounds):
+        result = island_percentiles(lambda_range, alpha_range, alpha_max_allowed)
         if result is not None:
-            results.append(result)
+            stats_arr[:, i] = [result[axis][q] for axis, q in STAT_KEYS]
+            survived[i] = True
     
-    n_survived = len(results)
+    n_survived = int(survived.sum())
     survival_rate = n_survived / n_runs
     
     print(f"\n✓ Completed {n_runs} jitter tests")
@@ -173,12 +200,12 @@ def run_jitter_robustness_test(envelope_path: Path, n_runs: int = 200,
         return
     
     # Compute statistics
-    lambda_p05 = [r['lambda_m']['p05'] for r in results]
-    lambda_p50 = [r['lambda_m']['p50'] for r in results]
-    lambda_p95 = [r['lambda_m']['p95'] for r in results]
-    alpha_p05 = [r['alpha']['p05'] for r in results]
-    alpha_p50 = [r['alpha']['p50'] for r in results]
-    alpha_p95 = [r['alpha']['p95'] for r in results]
+    valid = np.ascontiguousarray(stats_arr[:, survived])
+    means = valid.mean(axis=1)
+    stds = valid.std(axis=1)
+    mins = valid.min(axis=1)
+    maxs = valid.max(axis=1)
+    lambda_p05, lambda_p50, lambda_p95, alpha_p05, alpha_p50, alpha_p95 = valid
     
     summary = {
         'n_runs': n_runs,
@@ -186,97 +213,76 @@ def run_jitter_robustness_test(envelope_path: Path, n_runs: int = 200,
         'survival_rate': float(survival_rate),
         'lambda_m': {
             'p05': {
-                'mean': float(np.mean(lambda_p05)),
-                'std': float(np.std(lambda_p05)),
-                'min': float(np.min(lambda_p05)),
-                'max': float(np.max(lambda_p05)),
+                'mean': float(means[0]),
+                'std': float(stds[0]),
+                'min': float(mins[0]),
+                'max': float(maxs[0]),
             },
             'p50': {
-                'mean': float(np.mean(lambda_p50)),
-                'std': float(np.std(lambda_p50)),
+                'mean': float(means[1]),
+                'std': float(stds[1]),
             },
             'p95': {
-                'mean': float(np.mean(lambda_p95)),
-                'std': float(np.std(lambda_p95)),
-                'min': float(np.min(lambda_p95)),
-                'max': float(np.max(lambda_p95)),
+                'mean': float(means[2]),
+                'std': float(stds[2]),
+                'min': float(mins[2]),
+                'max': float(maxs[2]),
             },
         },
         'alpha': {
             'p05': {
-                'mean': float(np.mean(alpha_p05)),
-                'std': float(np.std(alpha_p05)),
+                'mean': float(means[3]),
+                'std': float(stds[3]),
             },
             'p50': {
-                'mean': float(np.mean(alpha_p50)),
-                'std': float(np.std(alpha_p50)),
+                'mean': float(means[4]),
+                'std': float(stds[4]),
             },
             'p95': {
-                'mean': float(np.mean(alpha_p95)),
-                'std': float(np.std(alpha_p95)),
+                'mean': float(means[5]),
+                'std': float(stds[5]),
             },
         },
     }
     
     # Save summary
     summary_path = output_dir / 'jitter_robustness_summary.json'
-    summary_path.write_text(json.dumps(summary, indent=2))
+    write_json(summary_path, summary)
     print(f"✓ Saved summary: {summary_path}")
     
-    # Plot distributions
-    fig, axes = plt.subplots(2, 3, figsize=(15, 10))
-    
-    # Lambda distributions
-    axes[0, 0].hist(lambda_p05, bins=30, alpha=0.7, edgecolor='black')
-    axes[0, 0].set_xlabel('λ p05 (m)')
-    axes[0, 0].set_ylabel('Frequency')
-    axes[0, 0].set_title('Lambda p05 Distribution')
-    axes[0, 0].axvline(np.mean(lambda_p05), color='red', linestyle='--', label=f'Mean: {np.mean(lambda_p05):.2e}')
-    axes[0, 0].legend()
-    
-    axes[0, 1].hist(lambda_p50, bins=30, alpha=0.7, edgecolor='black')
-    axes[0, 1].set_xlabel('λ p50 (m)')
-    axes[0, 1].set_ylabel('Frequency')
-    axes[0, 1].set_title('Lambda p50 Distribution')
-    axes[0, 1].axvline(np.mean(lambda_p50), color='red', linestyle='--', label=f'Mean: {np.mean(lambda_p50):.2e}')
-    axes[0, 1].legend()
-    
-    axes[0, 2].hist(lambda_p95, bins=30, alpha=0.7, edgecolor='black')
-    axes[0, 2].set_xlabel('λ p95 (m)')
-    axes[0, 2].set_ylabel('Frequency')
-    axes[0, 2].set_title('Lambda p95 Distribution')
-    axes[0, 2].axvline(np.mean(lambda_p95), color='red', linestyle='--', label=f'Mean: {np.mean(lambda_p95):.2e}')
-    axes[0, 2].legend()
-    
-    # Alpha distributions
-    axes[1, 0].hist(alpha_p05, bins=30, alpha=0.7, edgecolor='black')
-    axes[1, 0].set_xlabel('α p05')
-    axes[1, 0].set_ylabel('Frequency')
-    axes[1, 0].set_title('Alpha p05 Distribution')
-    axes[1, 0].set_xscale('log')
-    axes[1, 0].axvline(np.mean(alpha_p05), color='red', linestyle='--')
-    
-    axes[1, 1].hist(alpha_p50, bins=30, alpha=0.7, edgecolor='black')
-    axes[1, 1].set_xlabel('α p50')
-    axes[1, 1].set_ylabel('Frequency')
-    axes[1, 1].set_title('Alpha p50 Distribution')
-    axes[1, 1].set_xscale('log')
-    axes[1, 1].axvline(np.mean(alpha_p50), color='red', linestyle='--')
-    
-    axes[1, 2].hist(alpha_p95, bins=30, alpha=0.7, edgecolor='black')
-    axes[1, 2].set_xlabel('α p95')
-    axes[1, 2].set_ylabel('Frequency')
-    axes[1, 2].set_title('Alpha p95 Distribution')
-    axes[1, 2].set_xscale('log')
-    axes[1, 2].axvline(np.mean(alpha_p95), color='red', linestyle='--')
-    
-    plt.suptitle(f'Jitter Robustness Test (σ=0.1, {n_runs} runs, {survival_rate:.1%} survival)', fontsize=14)
-    plt.tight_layout()
+    # Plot distributions: bin each series once with np.histogram and draw the
+    # bars directly; constrained_layout replaces the tight_layout reflow
+    fig, axes = plt.subplots(2, 3, figsize=(15, 10), constrained_layout=True)
+    panels = [
+        (axes[0, 0], lambda_p05, 'λ p05 (m)', 'Lambda p05 Distribution', False),
+        (axes[0, 1], lambda_p50, 'λ p50 (m)', 'Lambda p50 Distribution', False),
+        (axes[0, 2], lambda_p95, 'λ p95 (m)', 'Lambda p95 Distribution', False),
+        (axes[1, 0], alpha_p05, 'α p05', 'Alpha p05 Distribution', True),
+        (axes[1, 1], alpha_p50, 'α p50', 'Alpha p50 Distribution', True),
+        (axes[1, 2], alpha_p95, 'α p95', 'Alpha p95 Distribution', True),
+    ]
+    for (ax, values, xlabel, title, log_x), mean in zip(panels, means):
+        counts, edges = np.histogram(values, bins=30)
+        ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+               alpha=0.7, edgecolor='black')
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel('Frequency')
+        ax.set_title(title)
+        if log_x:
+            # Alpha distributions
+            ax.set_xscale('log')
+            ax.axvline(mean, color='red', linestyle='--')
+        else:
+            # Lambda distributions
+            ax.axvline(mean, color='red', linestyle='--', label=f'Mean: {mean:.2e}')
+            ax.legend()
+    
+    fig.suptitle(f'Jitter Robustness Test (σ=0.1, {n_runs} runs, {survival_rate:.1%} survival)', fontsize=14)
     
     plot_path = output_dir / 'jitter_robustness_plot.png'
-    plt.savefig(plot_path, dpi=200, bbox_inches='tight')
+    fig.savefig(plot_path, dpi=dpi, bbox_inches='tight')
     print(f"✓ Saved plot: {plot_path}")
-    plt.close()
+    plt.close(fig)
     
     # Print summary
     print("\n" + "="*60)
@@ -285,14 +291,14 @@ def run_jitter_robustness_test(envelope_path: Path, n_runs: int = 200,
     print(f"Survival rate: {survival_rate:.1%} ({n_survived}/{n_runs})")
     print()
     print("Lambda percentiles (mean ± std):")
-    print(f"  p05: {np.mean(lambda_p05):.2e} ± {np.std(lambda_p05):.2e} m")
-    print(f"  p50: {np.mean(lambda_p50):.2e} ± {np.std(lambda_p50):.2e} m")
-    print(f"  p95: {np.mean(lambda_p95):.2e} ± {np.std(lambda_p95):.2e} m")
+    print(f"  p05: {means[0]:.2e} ± {stds[0]:.2e} m")
+    print(f"  p50: {means[1]:.2e} ± {stds[1]:.2e} m")
+    print(f"  p95: {means[2]:.2e} ± {stds[2]:.2e} m")
     print()
     print("Alpha percentiles (mean ± std):")
-    print(f"  p05: {np.mean(alpha_p05):.2e} ± {np.std(alpha_p05):.2e}")
-    print(f"  p50: {np.mean(alpha_p50):.2e} ± {np.std(alpha_p50):.2e}")
-    print(f"  p95: {np.mean(alpha_p95):.2e} ± {np.std(alpha_p95):.2e}")
+    print(f"  p05: {means[3]:.2e} ± {stds[3]:.2e}")
+    print(f"  p50: {means[4]:.2e} ± {stds[4]:.2e}")
+    print(f"  p95: {means[5]:.2e} ± {stds[5]:.2e}")
     print()
     if survival_rate > 0.7:
         print("✅ Island is robust under digitization uncertainty (>70% survival)")
@@ -314,6 +320,10 @@ def main():
     ap.add_argument('--out-dir', type=str,
                    default='experiments/constraints/results',
                    help='Output directory')
+    ap.add_argument('--seed', type=int, default=None,
+                   help='Random seed for the jitter noise (default: unseeded)')
+    ap.add_argument('--dpi', type=int, default=120,
+                   help='PNG resolution (default 120; use 200 for publication figures)')
     args = ap.parse_args()
     
     envelope_path = Path(args.envelope)
@@ -323,7 +333,8 @@ def main():
         print(f"Error: Envelope file not found: {envelope_path}")
         return 1
     
-    run_jitter_robustness_test(envelope_path, n_runs=args.n_runs, output_dir=output_dir)
+    run_jitter_robustness_test(envelope_path, n_runs=args.n_runs, output_dir=output_dir,
+                               seed=args.seed, dpi=args.dpi)
     
     return 0
 
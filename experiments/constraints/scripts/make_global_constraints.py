@@ -13,12 +13,70 @@ Outputs:
 """
 import argparse
 import json
+import math
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
-import matplotlib.pyplot as plt
+import numpy as np
 import matplotlib.patches as mpatches
-from matplotlib.gridspec import GridSpec
+# Object-oriented Matplotlib on an explicit Agg canvas (no pyplot state)
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+try:
+    import orjson  # Optional: faster JSON parsing/serialization
+except ImportError:
+    orjson = None
+
+def read_json(json_path: Path) -> Dict:
+    """
+    Parse a JSON file, with orjson when available.
+    
+    Falls back to the stdlib parser for files orjson rejects (e.g. the
+    NaN/Infinity literals json.dumps emits for non-finite floats).
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(json_path.read_bytes())
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(json_path.read_text())
+
+def _has_non_finite(obj: Any) -> bool:
+    """Whether a JSON payload contains NaN/±inf anywhere (incl. NumPy values)."""
+    if isinstance(obj, float):  # includes np.float64
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    if isinstance(obj, (np.ndarray, np.floating)):
+        return np.asarray(obj).dtype.kind == 'f' and not np.isfinite(obj).all()
+    return False
+
+def _json_default(obj: Any) -> Any:
+    """Stdlib-writer fallback for the NumPy types orjson serializes natively."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def write_json(json_path: Path, obj: Any) -> None:
+    """
+    Write obj as 2-space-indented UTF-8 JSON, with orjson when available.
+    
+    Output does not depend on whether orjson is installed: payloads with
+    non-finite floats go through json.dumps, which keeps the NaN/Infinity
+    literals read_json accepts (orjson would write null), and NumPy scalars
+    and arrays are accepted by both writers.
+    """
+    if orjson is not None and not _has_non_finite(obj):
+        json_path.write_bytes(orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        json_path.write_text(json.dumps(obj, indent=2, ensure_ascii=False,
+                                        default=_json_default), encoding='utf-8')
 
 def load_qrng_bounds(qrng_json_path: Path) -> Optional[Dict]:
     """Load QRNG constraint summary."""
@@ -26,7 +84,7 @@ def load_qrng_bounds(qrng_json_path: Path) -> Optional[Dict]:
         print(f"Warning: {qrng_json_path} not found. Skipping QRNG bounds.")
         return None
     
-    data = json.loads(qrng_json_path.read_text())
+    data = read_json(qrng_json_path)
     return {
         'epsilon_upper_95': data.get('epsilon_upper_95', None),
         'epsilon_lower_95': data.get('epsilon_lower_95', None),
@@ -40,7 +98,7 @@ def load_fifth_force_bounds(ff_json_path: Path) -> Optional[Dict]:
         print(f"Warning: {ff_json_path} not found. Skipping fifth-force bounds.")
         return None
     
-    return json.loads(ff_json_path.read_text())
+    return read_json(ff_json_path)
 
 def load_higgs_bounds(higgs_json_path: Path) -> Optional[Dict]:
     """Load Higgs portal constraint bounds."""
@@ -48,17 +106,29 @@ def load_higgs_bounds(higgs_json_path: Path) -> Optional[Dict]:
         print(f"Warning: {higgs_json_path} not found. Skipping Higgs portal bounds.")
         return None
     
-    return json.loads(higgs_json_path.read_text())
+    return read_json(higgs_json_path)
+
+def _draw_table(ax, rows, col_labels):
+    """Draw a two-column, left-aligned table centred in ax."""
+    table = ax.table(cellText=rows, colLabels=col_labels,
+                     loc='center', cellLoc='left', colWidths=[0.3, 0.7])
+    table.auto_set_font_size(False)
+    table.set_fontsize(10)
+    table.scale(1, 1.6)
+    return table
 
 def create_global_figure(qrng_bounds: Optional[Dict],
                          ff_bounds: Optional[Dict],
                          higgs_bounds: Optional[Dict],
-                         output_path: Path):
+                         output_path: Path, dpi: int = 120):
     """
     Create combined global constraints figure.
+    
+    The PNG is written at `dpi` (120 by default; 200 for print).
     """
-    fig = plt.figure(figsize=(14, 10))
-    gs = GridSpec(2, 2, figure=fig, hspace=0.3, wspace=0.3)
+    fig = Figure(figsize=(14, 10))
+    FigureCanvasAgg(fig)
+    gs = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3)
     
     # Panel 1: QRNG constraints (epsilon bounds)
     ax1 = fig.add_subplot(gs[0, 0])
@@ -81,12 +151,18 @@ def create_global_figure(qrng_bounds: Optional[Dict],
                 ha='center', va='center', transform=ax1.transAxes)
         ax1.set_title('QRNG Constraints', fontsize=12)
     
+    # Panels 2-4 are tables on axis-less panels: no meaningless 0-1 ticks to
+    # lay out, and no tab-aligned monospace text (tabs render as missing glyphs)
+    
     # Panel 2: Fifth-force (Yukawa) constraints
     ax2 = fig.add_subplot(gs[0, 1])
+    ax2.set_axis_off()
     if ff_bounds:
         # Placeholder visualization - would show exclusion region
-        ax2.text(0.5, 0.5, f"Fifth-Force Bounds\nλ range: {ff_bounds.get('lambda_min', 'N/A'):.2e} - {ff_bounds.get('lambda_max', 'N/A'):.2e} m\nα_max: {ff_bounds.get('alpha_max_allowed', 'N/A'):.2e}",
-                ha='center', va='center', transform=ax2.transAxes, fontsize=10)
+        _draw_table(ax2, [
+            ['λ range', f"{ff_bounds.get('lambda_min', 'N/A'):.2e} - {ff_bounds.get('lambda_max', 'N/A'):.2e} m"],
+            ['α_max', f"{ff_bounds.get('alpha_max_allowed', 'N/A'):.2e}"],
+        ], ['Bound', 'Value'])
         ax2.set_title('Fifth-Force (Yukawa) Constraints', fontsize=12)
     else:
         ax2.text(0.5, 0.5, 'Fifth-force bounds\nnot available',
@@ -95,12 +171,14 @@ def create_global_figure(qrng_bounds: Optional[Dict],
     
     # Panel 3: Higgs portal constraints
     ax3 = fig.add_subplot(gs[1, 0])
+    ax3.set_axis_off()
     if higgs_bounds:
         mass_range = higgs_bounds.get('mass_range_gev', [1, 1000])
         coupling_range = higgs_bounds.get('coupling_range', [1e-6, 1e-2])
-        ax3.text(0.5, 0.5, f"Higgs Portal Bounds\nm_Φ: {mass_range[0]:.1f} - {mass_range[1]:.1f} GeV\n"
-                           f"g_ΦH: {coupling_range[0]:.2e} - {coupling_range[1]:.2e}",
-                ha='center', va='center', transform=ax3.transAxes, fontsize=10)
+        _draw_table(ax3, [
+            ['m_Φ', f"{mass_range[0]:.1f} - {mass_range[1]:.1f} GeV"],
+            ['g_ΦH', f"{coupling_range[0]:.2e} - {coupling_range[1]:.2e}"],
+        ], ['Bound', 'Value'])
         ax3.set_title('Higgs Portal Constraints', fontsize=12)
     else:
         ax3.text(0.5, 0.5, 'Higgs portal bounds\nnot available',
@@ -109,35 +187,30 @@ def create_global_figure(qrng_bounds: Optional[Dict],
     
     # Panel 4: Summary table
     ax4 = fig.add_subplot(gs[1, 1])
-    ax4.axis('off')
-    
-    summary_text = "Global Constraints Summary\n\n"
-    summary_text += "Channel\t\tStatus\n"
-    summary_text += "-" * 40 + "\n"
+    ax4.set_axis_off()
     
+    rows = []
     if qrng_bounds:
-        summary_text += f"QRNG\t\t|ε| < {abs(qrng_bounds.get('epsilon_upper_95', 0)):.4f}\n"
+        rows.append(['QRNG', f"|ε| < {abs(qrng_bounds.get('epsilon_upper_95', 0)):.4f}"])
     else:
-        summary_text += "QRNG\t\tNot available\n"
+        rows.append(['QRNG', 'Not available'])
     
     if ff_bounds:
-        summary_text += f"Fifth-force\tExcluded above α={ff_bounds.get('alpha_max_allowed', 'N/A')}\n"
+        rows.append(['Fifth-force', f"Excluded above α={ff_bounds.get('alpha_max_allowed', 'N/A'):.2e}"])
     else:
-        summary_text += "Fifth-force\tNot available\n"
+        rows.append(['Fifth-force', 'Not available'])
     
     if higgs_bounds:
-        summary_text += f"Higgs portal\tBounds on (m_Φ, g_ΦH)\n"
+        rows.append(['Higgs portal', 'Bounds on (m_Φ, g_ΦH)'])
     else:
-        summary_text += "Higgs portal\tNot available\n"
+        rows.append(['Higgs portal', 'Not available'])
     
-    ax4.text(0.1, 0.5, summary_text, fontsize=10, family='monospace',
-            verticalalignment='center', transform=ax4.transAxes)
-    ax4.set_title('Summary', fontsize=12)
+    _draw_table(ax4, rows, ['Channel', 'Status'])
+    ax4.set_title('Global Constraints Summary', fontsize=12)
     
-    plt.suptitle('MQGT-SCF Global Constraints Across Channels', fontsize=16, y=0.98)
-    plt.savefig(output_path, dpi=200, bbox_inches='tight')
+    fig.suptitle('MQGT-SCF Global Constraints Across Channels', fontsize=16, y=0.98)
+    fig.savefig(output_path, dpi=dpi, bbox_inches='tight')
     print(f"✓ Saved: {output_path}")
-    plt.close()
     
     # Save combined JSON
     global_summary = {
@@ -146,7 +219,7 @@ def create_global_figure(qrng_bounds: Optional[Dict],
         'higgs_portal': higgs_bounds
     }
     json_path = output_path.with_suffix('.json')
-    json_path.write_text(json.dumps(global_summary, indent=2))
+    write_json(json_path, global_summary)
     print(f"✓ Saved summary: {json_path}")
 
 def main():
@@ -163,6 +236,8 @@ def main():
     ap.add_argument('--out', type=str,
                    default='experiments/constraints/results/global_constraints.png',
                    help='Output PNG path')
+    ap.add_argument('--dpi', type=int, default=120,
+                   help='PNG resolution (default 120; use 200 for publication figures)')
     args = ap.parse_args()
     
     qrng_path = Path(args.qrng_json)
@@ -175,7 +250,7 @@ def main():
     ff_bounds = load_fifth_force_bounds(ff_path)
     higgs_bounds = load_higgs_bounds(higgs_path)
     
-    create_global_figure(qrng_bounds, ff_bounds, higgs_bounds, output_path)
+    create_global_figure(qrng_bounds, ff_bounds, higgs_bounds, output_path, dpi=args.dpi)
     print("Done.")
 
 if __name__ == '__main__':
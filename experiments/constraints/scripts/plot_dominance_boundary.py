@@ -6,24 +6,38 @@ Creates a 2D visualization in (m_φ, θ) or (λ, α) space showing which constra
 is tightest at each point, with emphasis on the boundary between QRNG_tilt and ATLAS_mu.
 """
 import argparse
-import json
 from pathlib import Path
 from typing import Optional, Dict
 
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from matplotlib.colors import ListedColormap
+from matplotlib.patches import Patch
+# Object-oriented Matplotlib on an explicit Agg canvas (no pyplot state)
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import sys
 
 # Add scripts directory to path
 sys.path.insert(0, str(Path(__file__).parent))
-from derive_alpha_from_portal import map_parameters_to_yukawa
+from check_overlap_derived_alpha import derive_yukawa_grid
+from make_global_constraints import read_json
 from active_constraint_labeling import (
     label_constraints_for_grid,
     CONSTRAINT_LABELS
 )
 
+# Panel colours indexed by label + 1:
+# -1: Excluded (black/gray), 0: ATLAS_mu (blue), 1: Higgs_inv (green),
+# 2: Fifth_force (red), 3: QRNG_tilt (orange). Built once and shared by
+# both panels (legend handles are copied by Legend, so sharing is safe).
+_COLORS = ['#2c2c2c', '#1f77b4', '#2ca02c', '#d62728', '#ff7f0e']
+_CMAP = ListedColormap(_COLORS)
+_LEGEND_PATCHES = [
+    Patch(facecolor=c, label=l)
+    for c, l in zip(_COLORS, ['Excluded', 'ATLAS μ', 'Higgs inv', 'Fifth-force', 'QRNG tilt'])
+]
+
 
 def create_dominance_plot(
     m_phi_min: float, m_phi_max: float, n_m_phi: int,
@@ -35,7 +49,8 @@ def create_dominance_plot(
     Theta_lab: float = 1.0,
     br_max: float = 0.145,
     use_normalized_slack: bool = True,
-    output_path: Path = None
+    output_path: Path = None,
+    dpi: int = 120
 ):
     """
     Create dominance boundary plot.
@@ -51,31 +66,15 @@ def create_dominance_plot(
         br_max: Maximum allowed BR(H→inv)
         use_normalized_slack: Use normalized slack for comparison
         output_path: Output file path
+        dpi: PNG resolution (120 by default; 200 for print)
     """
-    # Create parameter grids
-    m_phi_range = np.logspace(np.log10(m_phi_min), np.log10(m_phi_max), n_m_phi)
-    theta_range = np.logspace(np.log10(theta_min), np.log10(theta_max), n_theta)
-    M_PHI_GRID, THETA_GRID = np.meshgrid(m_phi_range, theta_range)
-    
-    # Derive Yukawa parameters
-    LAMBDA_GRID = np.zeros_like(M_PHI_GRID)
-    ALPHA_GRID = np.zeros_like(M_PHI_GRID)
-    
-    for i in range(n_theta):
-        for j in range(n_m_phi):
-            m_phi = M_PHI_GRID[i, j]
-            theta = THETA_GRID[i, j]
-            try:
-                lambda_m, alpha = map_parameters_to_yukawa(
-                    m_phi, theta,
-                    model='normalized',
-                    Theta=1.0  # Use unscreened for derivation
-                )
-                LAMBDA_GRID[i, j] = lambda_m
-                ALPHA_GRID[i, j] = alpha
-            except Exception as e:
-                LAMBDA_GRID[i, j] = np.nan
-                ALPHA_GRID[i, j] = np.nan
+    # Derive (λ, α) over the (m_φ, θ) grid; unscreened for derivation
+    M_PHI_GRID, THETA_GRID, LAMBDA_GRID, ALPHA_GRID = derive_yukawa_grid(
+        m_phi_min, m_phi_max, n_m_phi,
+        theta_min, theta_max, n_theta,
+        model='normalized',
+        Theta=1.0
+    )
     
     # Get constraint bounds
     alpha_max_allowed = None
@@ -101,24 +100,37 @@ def create_dominance_plot(
     )
     
     # Create figure with two panels: (m_φ, θ) and (λ, α)
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 8))
+    fig = Figure(figsize=(16, 8))
+    FigureCanvasAgg(fig)
+    ax1, ax2 = fig.subplots(1, 2)
+    
+    # Grids finer than a panel's pixel budget are stride-decimated for
+    # display only (nearest sample, labels stay integers); the summary
+    # below still uses the full grid
+    max_cells = int(fig.get_figwidth() / 2 * dpi)
+    rows = slice(None, None, -(-n_theta // max_cells))
+    cols = slice(None, None, -(-n_m_phi // max_cells))
+    shown_labels = constraint_labels[rows, cols]
     
     # Panel 1: (m_φ, θ) space
     plot_dominance_in_fundamental_space(
-        ax1, M_PHI_GRID, THETA_GRID, constraint_labels,
+        ax1, M_PHI_GRID[rows, cols], THETA_GRID[rows, cols], shown_labels,
         "Fundamental Parameter Space\n(m_φ, θ)"
     )
     
     # Panel 2: (λ, α) space
     plot_dominance_in_yukawa_space(
-        ax2, LAMBDA_GRID, ALPHA_GRID, constraint_labels,
+        ax2, LAMBDA_GRID[rows, cols], ALPHA_GRID[rows, cols], shown_labels,
         "Yukawa Parameter Space\n(λ, α)"
     )
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=200, bbox_inches='tight')
+    # One colour key for both panels (a per-axes patch legend was replaced by
+    # the boundary-scatter legend anyway)
+    fig.tight_layout()
+    fig.legend(handles=_LEGEND_PATCHES, loc='lower center', ncol=5, fontsize=10,
+               bbox_to_anchor=(0.5, -0.06))
+    fig.savefig(output_path, dpi=dpi, bbox_inches='tight')
     print(f"✓ Saved dominance boundary plot: {output_path}")
-    plt.close()
     
     # Print summary statistics
     viable_mask = constraint_labels >= 0
@@ -138,20 +150,10 @@ def create_dominance_plot(
 
 def plot_dominance_in_fundamental_space(ax, m_phi_grid, theta_grid, constraint_labels, title):
     """Plot dominance in (m_φ, θ) space."""
-    # Create colormap: different colors for each constraint
-    # -1: Excluded (black/gray)
-    # 0: ATLAS_mu (blue)
-    # 1: Higgs_inv (green)
-    # 2: Fifth_force (red)
-    # 3: QRNG_tilt (orange)
-    
-    colors = ['#2c2c2c', '#1f77b4', '#2ca02c', '#d62728', '#ff7f0e']
-    cmap = ListedColormap(colors)
-    
-    # Plot
+    # Plot (one colour per constraint, see _COLORS)
     im = ax.pcolormesh(
         m_phi_grid, theta_grid, constraint_labels,
-        cmap=cmap, vmin=-1, vmax=4, shading='auto', alpha=0.7
+        cmap=_CMAP, vmin=-1, vmax=4, shading='auto', alpha=0.7
     )
     
     ax.set_xscale('log')
@@ -161,17 +163,6 @@ def plot_dominance_in_fundamental_space(ax, m_phi_grid, theta_grid, constraint_l
     ax.set_title(title, fontsize=14)
     ax.grid(True, alpha=0.3, which='both')
     
-    # Add legend
-    from matplotlib.patches import Patch
-    legend_elements = [
-        Patch(facecolor=colors[0], label='Excluded'),
-        Patch(facecolor=colors[1], label='ATLAS μ'),
-        Patch(facecolor=colors[2], label='Higgs inv'),
-        Patch(facecolor=colors[3], label='Fifth-force'),
-        Patch(facecolor=colors[4], label='QRNG tilt'),
-    ]
-    ax.legend(handles=legend_elements, loc='upper right', fontsize=10)
-    
     # Highlight boundary between QRNG_tilt and ATLAS_mu
     highlight_dominance_boundary(ax, m_phi_grid, theta_grid, constraint_labels, 
                                  constraint1=3, constraint2=0, color='yellow', linewidth=2)
@@ -179,14 +170,10 @@ def plot_dominance_in_fundamental_space(ax, m_phi_grid, theta_grid, constraint_l
 
 def plot_dominance_in_yukawa_space(ax, lambda_grid, alpha_grid, constraint_labels, title):
     """Plot dominance in (λ, α) space."""
-    # Same colormap as above
-    colors = ['#2c2c2c', '#1f77b4', '#2ca02c', '#d62728', '#ff7f0e']
-    cmap = ListedColormap(colors)
-    
-    # Plot
+    # Plot (same colormap as the fundamental panel)
     im = ax.pcolormesh(
         lambda_grid, alpha_grid, constraint_labels,
-        cmap=cmap, vmin=-1, vmax=4, shading='auto', alpha=0.7
+        cmap=_CMAP, vmin=-1, vmax=4, shading='auto', alpha=0.7
     )
     
     ax.set_xscale('log')
@@ -202,58 +189,51 @@ def plot_dominance_in_yukawa_space(ax, lambda_grid, alpha_grid, constraint_label
 
 
 def highlight_dominance_boundary(ax, x_grid, y_grid, constraint_labels, 
-                                 constraint1, constraint2, color='yellow', linewidth=2):
+                                 constraint1, constraint2, color='yellow', linewidth=2,
+                                 min_points: int = 5):
     """
     Highlight the boundary between two constraints.
     
     Finds points where one constraint is tightest and neighbors have the other constraint.
+    Nothing is drawn when fewer than min_points boundary cells are found.
     """
-    shape = constraint_labels.shape
+    # Compare each interior cell with its four neighbours via shifted slices
+    L = np.asarray(constraint_labels)
+    center = L[1:-1, 1:-1]
+    up, dn, lf, rt = L[:-2, 1:-1], L[2:, 1:-1], L[1:-1, :-2], L[1:-1, 2:]
     
-    # Find boundary points
-    boundary_x = []
-    boundary_y = []
+    # Check if this point has constraint1 and neighbors have constraint2 (or vice versa)
+    neigh_has_c1 = (up == constraint1) | (dn == constraint1) | (lf == constraint1) | (rt == constraint1)
+    neigh_has_c2 = (up == constraint2) | (dn == constraint2) | (lf == constraint2) | (rt == constraint2)
+    mask = ((center == constraint1) & neigh_has_c2) | ((center == constraint2) & neigh_has_c1)
+    if np.count_nonzero(mask) < min_points:
+        return
     
-    for i in range(1, shape[0] - 1):
-        for j in range(1, shape[1] - 1):
-            label = constraint_labels[i, j]
-            
-            # Check if this point has constraint1 and neighbors have constraint2 (or vice versa)
-            neighbors = [
-                constraint_labels[i-1, j],
-                constraint_labels[i+1, j],
-                constraint_labels[i, j-1],
-                constraint_labels[i, j+1]
-            ]
-            
-            if label == constraint1 and constraint2 in neighbors:
-                boundary_x.append(x_grid[i, j])
-                boundary_y.append(y_grid[i, j])
-            elif label == constraint2 and constraint1 in neighbors:
-                boundary_x.append(x_grid[i, j])
-                boundary_y.append(y_grid[i, j])
+    # Boolean indexing keeps the row-major order of the original scan
+    boundary_x = np.asarray(x_grid)[1:-1, 1:-1][mask]
+    boundary_y = np.asarray(y_grid)[1:-1, 1:-1][mask]
     
-    if len(boundary_x) > 0:
-        # Plot boundary points
-        ax.scatter(boundary_x, boundary_y, c=color, s=10, alpha=0.6, 
-                  label=f'Boundary: {CONSTRAINT_LABELS[constraint1]} ↔ {CONSTRAINT_LABELS[constraint2]}',
-                  zorder=10)
-        ax.legend(loc='upper right', fontsize=10)
+    # Plot boundary points
+    boundary = ax.scatter(boundary_x, boundary_y, c=color, s=10, alpha=0.6, 
+                          label=f'Boundary: {CONSTRAINT_LABELS[constraint1]} ↔ {CONSTRAINT_LABELS[constraint2]}',
+                          zorder=10)
+    # Explicit handle: no scan of the axes' artists for labels
+    ax.legend(handles=[boundary], loc='upper right', fontsize=10)
 
 
 def load_constraint_bounds(qrng_json: Path, ff_json: Path, higgs_json: Path):
     """Load constraint bounds from JSON files."""
     qrng_bounds = None
     if qrng_json.exists():
-        qrng_bounds = json.loads(qrng_json.read_text())
+        qrng_bounds = read_json(qrng_json)
     
     ff_bounds = None
     if ff_json.exists():
-        ff_bounds = json.loads(ff_json.read_text())
+        ff_bounds = read_json(ff_json)
     
     higgs_bounds = None
     if higgs_json.exists():
-        higgs_bounds = json.loads(higgs_json.read_text())
+        higgs_bounds = read_json(higgs_json)
     
     return qrng_bounds, ff_bounds, higgs_bounds
 
@@ -291,6 +271,8 @@ def main():
     ap.add_argument('--out', type=str,
                    default='experiments/constraints/results/dominance_boundary_plot.png',
                    help='Output file path')
+    ap.add_argument('--dpi', type=int, default=120,
+                   help='PNG resolution (default 120; use 200 for publication figures)')
     args = ap.parse_args()
     
     # Load constraints
@@ -314,7 +296,8 @@ def main():
         Theta_lab=args.Theta_lab,
         br_max=args.br_max,
         use_normalized_slack=True,
-        output_path=Path(args.out)
+        output_path=Path(args.out),
+        dpi=args.dpi
     )
     
     return 0
@@ -2,18 +2,84 @@
 Base classes for QRNG source adapters.
 """
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
+import numpy as np
 import pandas as pd
+from pandas.tseries.frequencies import to_offset
 
 
-@dataclass
 class StandardizedQRNGData:
-    """Standardized QRNG data format."""
-    timestamp: pd.Series  # Timestamps for each trial
-    bit: pd.Series  # Binary outcomes (0 or 1)
-    source_id: str  # Identifier for the source
-    meta: Dict[str, Any]  # Source-specific metadata
+    """
+    Standardized QRNG data format.
+    
+    timestamp may be given directly, or left as None with ts_start (and
+    ts_freq) set: the Series is then built from (ts_start, ts_freq, len(bit))
+    on first access, so sources that only carry aggregate stats never pay
+    for n timestamps unless something reads them. timestamp_start and
+    timestamp_end give the range without building the Series.
+    
+    Equality and repr follow the former dataclass over (timestamp, bit,
+    source_id, meta); both build a lazy timestamp. len() is the number of
+    trials.
+    """
+    
+    _FIELDS = ('timestamp', 'bit', 'source_id', 'meta')
+    
+    def __init__(self, timestamp: Optional[pd.Series], bit: pd.Series,
+                 source_id: str, meta: Dict[str, Any],
+                 ts_start: Optional[str] = None, ts_freq: str = '1s'):
+        if timestamp is not None:
+            self.timestamp = timestamp  # Timestamps for each trial
+        elif ts_start is None:
+            raise ValueError("Either timestamp or ts_start is required")
+        self.bit = bit  # Binary outcomes (0 or 1)
+        self.source_id = source_id  # Identifier for the source
+        self.meta = meta  # Source-specific metadata
+        self._ts_start = ts_start
+        self._ts_freq = ts_freq
+    
+    @cached_property
+    def timestamp(self) -> pd.Series:
+        """Timestamps for each trial (materialized on first access)."""
+        return pd.Series(pd.date_range(start=self._ts_start, periods=len(self),
+                                       freq=self._ts_freq))
+    
+    @property
+    def timestamp_start(self) -> pd.Timestamp:
+        """First timestamp (computed from ts_start/ts_freq while still lazy)."""
+        if self.timestamp_materialized or len(self) == 0:
+            return self.timestamp.iloc[0]
+        # date_range rolls ts_start onto the frequency, so ask it for one point
+        return pd.date_range(start=self._ts_start, periods=1, freq=self._ts_freq)[0]
+    
+    @property
+    def timestamp_end(self) -> pd.Timestamp:
+        """Last timestamp (computed from ts_start/ts_freq while still lazy)."""
+        if self.timestamp_materialized or len(self) == 0:
+            return self.timestamp.iloc[-1]
+        return self.timestamp_start + (len(self) - 1) * to_offset(self._ts_freq)
+    
+    @property
+    def timestamp_materialized(self) -> bool:
+        """Whether the timestamp Series has been built (or was given)."""
+        return 'timestamp' in self.__dict__
+    
+    def __len__(self) -> int:
+        """Number of trials."""
+        return len(self.bit)
+    
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (tuple(getattr(self, f) for f in self._FIELDS)
+                == tuple(getattr(other, f) for f in self._FIELDS))
+    
+    __hash__ = None  # Mutable, compared by value (as the dataclass was)
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{f}={getattr(self, f)!r}" for f in self._FIELDS)
+        return f"{self.__class__.__qualname__}({fields})"
     
     def to_dataframe(self) -> pd.DataFrame:
         """Convert to DataFrame for analysis."""
@@ -45,13 +111,17 @@ class QRNGSourceAdapter:
     
     def validate(self, data: StandardizedQRNGData) -> bool:
         """Validate standardized data format."""
-        if not isinstance(data.timestamp, pd.Series):
-            return False
         if not isinstance(data.bit, pd.Series):
             return False
-        if len(data.timestamp) != len(data.bit):
-            return False
-        if not data.bit.isin([0, 1]).all():
+        # Lazy timestamps are built from len(bit) and always match it, so
+        # only given (or already built) timestamps are checked
+        if data.timestamp_materialized:
+            if not isinstance(data.timestamp, pd.Series):
+                return False
+            if len(data.timestamp) != len(data.bit):
+                return False
+        # Check values on the underlying array (no hash-based Series.isin)
+        if not np.isin(data.bit.to_numpy(), (0, 1)).all():
             return False
         return True
 
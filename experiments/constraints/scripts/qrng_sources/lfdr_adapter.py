@@ -9,8 +9,56 @@ from typing import Dict, Any
 import pandas as pd
 import numpy as np
 
+try:
+    import ijson  # Optional: streaming parser for large multi-run summaries
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # Optional: faster parsing of small summaries
+except ImportError:
+    orjson = None
+
 from .base_adapter import QRNGSourceAdapter, StandardizedQRNGData
 
+# Summaries at least this large are streamed with ijson (when installed)
+# instead of being decoded whole; the per-run global_summary.json is ~0.5 KB
+IJSON_MIN_BYTES = 1 << 20
+
+# Top-level summary fields read by LFDRAdapter.load
+LFDR_FIELDS = ('n', 'k', 'p_hat', 'epsilon_hat',
+               'epsilon_lower_95', 'epsilon_upper_95', 'BF10')
+
+
+def read_lfdr_summary(path: Path) -> Dict[str, Any]:
+    """
+    Read the LFDR summary fields from a global_summary.json.
+    
+    Large files are streamed key by key with ijson and only LFDR_FIELDS are
+    kept (parsing stops once all are seen); small files are decoded whole
+    with orjson, falling back to the stdlib json module.
+    
+    Args:
+        path: Path to global_summary.json
+    
+    Returns:
+        Dict of top-level summary fields (at least LFDR_FIELDS when present)
+    """
+    path = Path(path)
+    if ijson is not None and path.stat().st_size >= IJSON_MIN_BYTES:
+        data = {}
+        with open(path, 'rb') as f:
+            for key, value in ijson.kvitems(f, '', use_float=True):
+                if key in LFDR_FIELDS:
+                    data[key] = value
+                    if len(data) == len(LFDR_FIELDS):
+                        break
+        return data
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r') as f:
+        return json.load(f)
+
 
 def load_lfdr_source(path: Path) -> StandardizedQRNGData:
     """
@@ -34,29 +82,21 @@ class LFDRAdapter(QRNGSourceAdapter):
     
     def load(self, path: Path, **kwargs) -> StandardizedQRNGData:
         """Load LFDR data from JSON summary."""
-        with open(path, 'r') as f:
-            data = json.load(f)
+        data = read_lfdr_summary(path)
         
         n = data['n']
         k = data['k']
         
-        # Create synthetic timestamps (since we only have aggregate stats)
-        # Use sequential timestamps assuming uniform spacing
-        timestamps = pd.Series(pd.date_range(
-            start='2024-01-01',
-            periods=n,
-            freq='1s'  # 1 second intervals (adjustable)
-        ))
-        
-        # Create bit sequence: k ones, (n-k) zeros
-        bits = np.concatenate([
-            np.ones(k, dtype=int),
-            np.zeros(n - k, dtype=int)
-        ])
+        # Create bit sequence: k ones, (n-k) zeros. uint8 is 1 byte per bit
+        # instead of 8; shuffle draws the same permutation for any dtype, so
+        # seeded callers get the same sequence as with int64
+        bits = np.zeros(n, dtype=np.uint8)
+        bits[:k] = 1
         # Shuffle with fixed seed for reproducibility (seed set at module level or caller)
         # If seed not set, this will use current random state
         np.random.shuffle(bits)  # Shuffle to avoid ordering artifacts
-        bits = pd.Series(bits)
+        # Wrap without copying (pandas >= 3 copies ndarray inputs by default)
+        bits = pd.Series(bits, copy=False)
         
         meta = {
             'n': n,
@@ -69,11 +109,15 @@ class LFDRAdapter(QRNGSourceAdapter):
             'original_path': str(path)
         }
         
+        # Synthetic timestamps (since we only have aggregate stats): sequential,
+        # uniformly spaced, built lazily on first access of result.timestamp
         result = StandardizedQRNGData(
-            timestamp=timestamps,
+            timestamp=None,
             bit=bits,
             source_id=self.source_id,
-            meta=meta
+            meta=meta,
+            ts_start='2024-01-01',
+            ts_freq='1s'  # 1 second intervals (adjustable)
         )
         
         if not self.validate(result):
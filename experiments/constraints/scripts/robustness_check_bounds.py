@@ -5,18 +5,134 @@ Robustness check: vary constraint bounds by ±10% and test if dominance ranking
 Tests whether the QRNG_tilt bottleneck is robust to small changes in experimental bounds.
 """
 import argparse
+import hashlib
 import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
 import sys
 
+
+try:
+    import pyarrow.csv as pacsv  # Optional: multithreaded parser for large envelopes
+except ImportError:
+    pacsv = None
+
 # Add scripts directory to path
 sys.path.insert(0, str(Path(__file__).parent))
-from check_overlap_derived_alpha import compute_viable_region_derived_alpha, load_constraint_bounds
+from check_overlap_derived_alpha import (
+    compute_viable_region_derived_alpha, derive_yukawa_grid, load_constraint_bounds
+)
 from active_constraint_labeling import CONSTRAINT_LABELS
+from make_global_constraints import write_json
+
+
+# Envelope and derived grids installed once per worker process by
+# _init_worker, so they are not re-pickled with every job
+_worker_envelope = None
+_worker_grids = None
+
+
+def _init_worker(envelope_data: Optional[pd.DataFrame], grids: Tuple[np.ndarray, ...]):
+    """Store the shared envelope DataFrame and derived grids in a pool worker."""
+    global _worker_envelope, _worker_grids
+    _worker_envelope = envelope_data
+    _worker_grids = grids
+
+
+def _run_one_in_worker(job, **kwargs):
+    """Pool entry point: run a job against the worker's envelope and grids."""
+    return _run_one(job, envelope_data=_worker_envelope, grids=_worker_grids, **kwargs)
+
+
+# Constraint names reported in dominance summaries (labels >= 0), in label order
+_CONSTRAINT_NAMES = tuple(name for idx, name in sorted(CONSTRAINT_LABELS.items()) if idx >= 0)
+
+# Envelopes at least this large go through pyarrow (when installed); below it,
+# thread start-up costs more than pandas' single-threaded parse
+PYARROW_MIN_BYTES = 1 << 20
+
+# (label, description, bound group, key, sign, default bound if the group is missing).
+# Groups: 'qrng' / 'ff' scale a key of that bounds dict, 'br_max' scales br_max,
+# 'atlas' is recorded as a note (the ATLAS μ constraint is hardcoded).
+VARIATIONS = [
+    ('qrng_plus_10pct', 'QRNG epsilon_max', 'qrng', 'epsilon_upper_95', +1, 0.0008),
+    ('qrng_minus_10pct', 'QRNG epsilon_max', 'qrng', 'epsilon_upper_95', -1, 0.0008),
+    ('atlas_plus_10pct', 'ATLAS μ uncertainty', 'atlas', None, +1, None),
+    ('atlas_minus_10pct', 'ATLAS μ uncertainty', 'atlas', None, -1, None),
+    ('higgs_plus_10pct', 'Higgs BR', 'br_max', None, +1, None),
+    ('higgs_minus_10pct', 'Higgs BR', 'br_max', None, -1, None),
+    ('fifth_force_plus_10pct', 'Fifth-force alpha_max', 'ff', 'alpha_max_allowed', +1, 1e-6),
+    ('fifth_force_minus_10pct', 'Fifth-force alpha_max', 'ff', 'alpha_max_allowed', -1, 1e-6),
+]
+
+
+def load_envelope(csv_path: Path) -> pd.DataFrame:
+    """Load the envelope CSV, with pyarrow's CSV reader for large files."""
+    if pacsv is not None and csv_path.stat().st_size >= PYARROW_MIN_BYTES:
+        table = pacsv.read_csv(str(csv_path),
+                               read_options=pacsv.ReadOptions(use_threads=True))
+        return table.to_pandas()
+    return pd.read_csv(csv_path)
+
+
+def _scale_bound(bounds: Optional[Dict], key: str, factor: float, default: float) -> Dict:
+    """Copy bounds with bounds[key] scaled; missing bounds fall back to default * factor."""
+    scaled = bounds.copy() if bounds else {}
+    if key in scaled:
+        scaled[key] = scaled[key] * factor
+    elif bounds is None:
+        scaled = {key: default * factor}
+    return scaled
+
+
+def bounds_fingerprint(qrng_bounds: Optional[Dict], ff_bounds: Optional[Dict],
+                       higgs_bounds: Optional[Dict], br_max: float) -> str:
+    """
+    Canonical SHA-256 fingerprint of the bounds passed to one variation run.
+    
+    Returns:
+        Hex digest; equal bounds give equal fingerprints regardless of key order
+    """
+    payload = json.dumps([qrng_bounds, ff_bounds, higgs_bounds, br_max],
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _run_one(job, grid: Dict, envelope_data: Optional[pd.DataFrame],
+             grids: Tuple[np.ndarray, ...], Theta_lab: float, use_normalized_slack: bool):
+    """
+    Run a single bound variation (top-level so it pickles for worker processes).
+    
+    Args:
+        job: (label, message, qrng_bounds, ff_bounds, higgs_bounds, br_max) tuple
+        grid: (m_phi, theta) grid keyword arguments
+        envelope_data: Envelope DataFrame
+        grids: derive_yukawa_grid() output for grid (shared by all variations)
+        Theta_lab: Screening factor for lab experiments
+        use_normalized_slack: Use normalized slack for dominance comparison
+    
+    Returns:
+        (label, dominance summary) tuple
+    """
+    label, message, qrng_bounds, ff_bounds, higgs_bounds, br_max = job
+    print(message)
+    result = compute_viable_region_derived_alpha(
+        qrng_bounds=qrng_bounds, ff_bounds=ff_bounds, higgs_bounds=higgs_bounds,
+        envelope_data=envelope_data,
+        model='normalized',
+        Theta_lab=Theta_lab,
+        br_max=br_max,
+        use_normalized_slack=use_normalized_slack,
+        grids=grids,
+        **grid
+    )
+    return label, extract_dominance_summary(result)
 
 
 def run_robustness_check(
@@ -29,150 +145,83 @@ def run_robustness_check(
     Theta_lab: float = 1.0,
     br_max: float = 0.145,
     use_normalized_slack: bool = True,
-    variation: float = 0.1  # ±10%
+    variation: float = 0.1,  # ±10%
+    max_workers: Optional[int] = None,
+    executor: Optional[Executor] = None
 ) -> Dict:
     """
     Run robustness check by varying bounds.
     
+    The variations are independent, so they are dispatched to a process pool
+    when more than one worker is available; with a single worker they run
+    in-process in order.
+    
+    Args:
+        max_workers: Worker processes (default: os.cpu_count())
+        executor: Existing pool to run the jobs on instead of starting one,
+            so batch callers can reuse warm workers; the caller owns its
+            lifetime and max_workers is ignored
+    
     Returns:
         Dictionary with results for each bound variation
     """
+    # Keys are inserted in report order; summaries are filled in after the runs
     results = {}
+    jobs = []
+    fingerprints = {}  # bounds fingerprint -> label of the job that computes it
+    duplicates = {}  # label -> label of an identical earlier job
+    
+    def queue(label, message, qrng, ff, higgs, br):
+        results[label] = None
+        fingerprint = bounds_fingerprint(qrng, ff, higgs, br)
+        if fingerprint in fingerprints:
+            # e.g. a bound missing its varied key leaves the variation equal to baseline
+            duplicates[label] = fingerprints[fingerprint]
+            return
+        fingerprints[fingerprint] = label
+        jobs.append((label, message, qrng, ff, higgs, br))
     
     # Baseline run
-    print("Running baseline (no variation)...")
-    baseline = compute_viable_region_derived_alpha(
-        m_phi_min, m_phi_max, n_m_phi,
-        theta_min, theta_max, n_theta,
-        qrng_bounds, ff_bounds, higgs_bounds,
-        envelope_data,
-        model='normalized',
-        Theta_lab=Theta_lab,
-        br_max=br_max,
-        use_normalized_slack=use_normalized_slack
-    )
-    results['baseline'] = extract_dominance_summary(baseline)
-    
-    # Variation 1: QRNG epsilon_max +10%
-    print(f"\nRunning QRNG epsilon_max +{variation*100:.0f}%...")
-    qrng_bounds_plus = qrng_bounds.copy() if qrng_bounds else {}
-    if 'epsilon_upper_95' in qrng_bounds_plus:
-        qrng_bounds_plus['epsilon_upper_95'] = qrng_bounds_plus['epsilon_upper_95'] * (1 + variation)
-    elif qrng_bounds is None:
-        # Create default
-        qrng_bounds_plus = {'epsilon_upper_95': 0.0008 * (1 + variation)}
-    
-    result_plus = compute_viable_region_derived_alpha(
-        m_phi_min, m_phi_max, n_m_phi,
-        theta_min, theta_max, n_theta,
-        qrng_bounds_plus, ff_bounds, higgs_bounds,
-        envelope_data,
-        model='normalized',
-        Theta_lab=Theta_lab,
-        br_max=br_max,
-        use_normalized_slack=use_normalized_slack
-    )
-    results['qrng_plus_10pct'] = extract_dominance_summary(result_plus)
-    
-    # Variation 2: QRNG epsilon_max -10%
-    print(f"\nRunning QRNG epsilon_max -{variation*100:.0f}%...")
-    qrng_bounds_minus = qrng_bounds.copy() if qrng_bounds else {}
-    if 'epsilon_upper_95' in qrng_bounds_minus:
-        qrng_bounds_minus['epsilon_upper_95'] = qrng_bounds_minus['epsilon_upper_95'] * (1 - variation)
-    elif qrng_bounds is None:
-        qrng_bounds_minus = {'epsilon_upper_95': 0.0008 * (1 - variation)}
-    
-    result_minus = compute_viable_region_derived_alpha(
-        m_phi_min, m_phi_max, n_m_phi,
-        theta_min, theta_max, n_theta,
-        qrng_bounds_minus, ff_bounds, higgs_bounds,
-        envelope_data,
-        model='normalized',
-        Theta_lab=Theta_lab,
-        br_max=br_max,
-        use_normalized_slack=use_normalized_slack
-    )
-    results['qrng_minus_10pct'] = extract_dominance_summary(result_minus)
-    
-    # Variation 3: ATLAS μ uncertainty +10%
-    print(f"\nRunning ATLAS μ uncertainty +{variation*100:.0f}%...")
-    # ATLAS μ constraint is hardcoded in compute_atlas_mu_slack
-    # We can't easily vary it without modifying the function
-    # For now, skip this variation (would require refactoring)
-    results['atlas_plus_10pct'] = {'note': 'ATLAS μ constraint hardcoded, skipping variation'}
-    
-    # Variation 4: ATLAS μ uncertainty -10%
-    results['atlas_minus_10pct'] = {'note': 'ATLAS μ constraint hardcoded, skipping variation'}
-    
-    # Variation 5: Higgs BR +10%
-    print(f"\nRunning Higgs BR +{variation*100:.0f}%...")
-    br_max_plus = br_max * (1 + variation)
-    result_br_plus = compute_viable_region_derived_alpha(
-        m_phi_min, m_phi_max, n_m_phi,
-        theta_min, theta_max, n_theta,
-        qrng_bounds, ff_bounds, higgs_bounds,
-        envelope_data,
-        model='normalized',
-        Theta_lab=Theta_lab,
-        br_max=br_max_plus,
-        use_normalized_slack=use_normalized_slack
-    )
-    results['higgs_plus_10pct'] = extract_dominance_summary(result_br_plus)
-    
-    # Variation 6: Higgs BR -10%
-    print(f"\nRunning Higgs BR -{variation*100:.0f}%...")
-    br_max_minus = br_max * (1 - variation)
-    result_br_minus = compute_viable_region_derived_alpha(
-        m_phi_min, m_phi_max, n_m_phi,
-        theta_min, theta_max, n_theta,
-        qrng_bounds, ff_bounds, higgs_bounds,
-        envelope_data,
-        model='normalized',
-        Theta_lab=Theta_lab,
-        br_max=br_max_minus,
-        use_normalized_slack=use_normalized_slack
-    )
-    results['higgs_minus_10pct'] = extract_dominance_summary(result_br_minus)
-    
-    # Variation 7: Fifth-force alpha_max +10%
-    print(f"\nRunning Fifth-force alpha_max +{variation*100:.0f}%...")
-    ff_bounds_plus = ff_bounds.copy() if ff_bounds else {}
-    if 'alpha_max_allowed' in ff_bounds_plus:
-        ff_bounds_plus['alpha_max_allowed'] = ff_bounds_plus['alpha_max_allowed'] * (1 + variation)
-    elif ff_bounds is None:
-        ff_bounds_plus = {'alpha_max_allowed': 1e-6 * (1 + variation)}
-    
-    result_ff_plus = compute_viable_region_derived_alpha(
-        m_phi_min, m_phi_max, n_m_phi,
-        theta_min, theta_max, n_theta,
-        qrng_bounds, ff_bounds_plus, higgs_bounds,
-        envelope_data,
-        model='normalized',
-        Theta_lab=Theta_lab,
-        br_max=br_max,
-        use_normalized_slack=use_normalized_slack
-    )
-    results['fifth_force_plus_10pct'] = extract_dominance_summary(result_ff_plus)
-    
-    # Variation 8: Fifth-force alpha_max -10%
-    print(f"\nRunning Fifth-force alpha_max -{variation*100:.0f}%...")
-    ff_bounds_minus = ff_bounds.copy() if ff_bounds else {}
-    if 'alpha_max_allowed' in ff_bounds_minus:
-        ff_bounds_minus['alpha_max_allowed'] = ff_bounds_minus['alpha_max_allowed'] * (1 - variation)
-    elif ff_bounds is None:
-        ff_bounds_minus = {'alpha_max_allowed': 1e-6 * (1 - variation)}
-    
-    result_ff_minus = compute_viable_region_derived_alpha(
-        m_phi_min, m_phi_max, n_m_phi,
-        theta_min, theta_max, n_theta,
-        qrng_bounds, ff_bounds_minus, higgs_bounds,
-        envelope_data,
-        model='normalized',
-        Theta_lab=Theta_lab,
-        br_max=br_max,
-        use_normalized_slack=use_normalized_slack
-    )
-    results['fifth_force_minus_10pct'] = extract_dominance_summary(result_ff_minus)
+    queue('baseline', "Running baseline (no variation)...",
+          qrng_bounds, ff_bounds, higgs_bounds, br_max)
+    
+    for label, description, group, key, sign, default in VARIATIONS:
+        if group == 'atlas':
+            # ATLAS μ constraint is hardcoded in compute_atlas_mu_slack
+            # We can't easily vary it without modifying the function
+            results[label] = {'note': 'ATLAS μ constraint hardcoded, skipping variation'}
+            continue
+        
+        factor = 1 + sign * variation
+        qrng, ff, br = qrng_bounds, ff_bounds, br_max
+        if group == 'qrng':
+            qrng = _scale_bound(qrng_bounds, key, factor, default)
+        elif group == 'ff':
+            ff = _scale_bound(ff_bounds, key, factor, default)
+        else:
+            br = br_max * factor
+        queue(label, f"\nRunning {description} {'+' if sign > 0 else '-'}{variation*100:.0f}%...",
+              qrng, ff, higgs_bounds, br)
+    
+    # Only the bounds vary between jobs: derive (λ, α) over the grid once
+    grid = dict(m_phi_min=m_phi_min, m_phi_max=m_phi_max, n_m_phi=n_m_phi,
+                theta_min=theta_min, theta_max=theta_max, n_theta=n_theta)
+    grids = derive_yukawa_grid(**grid, model='normalized')
+    common = dict(grid=grid, Theta_lab=Theta_lab, use_normalized_slack=use_normalized_slack)
+    n_workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    if executor is not None:
+        # Workers were not initialised with this envelope: send it with each job
+        results.update(executor.map(
+            partial(_run_one, envelope_data=envelope_data, grids=grids, **common), jobs))
+    elif n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                 initargs=(envelope_data, grids)) as executor:
+            results.update(executor.map(partial(_run_one_in_worker, **common), jobs))
+    else:
+        results.update(map(
+            partial(_run_one, envelope_data=envelope_data, grids=grids, **common), jobs))
+    for label, source in duplicates.items():
+        results[label] = dict(results[source])
     
     return results
 
@@ -195,6 +244,11 @@ def extract_dominance_summary(summary: Dict) -> Dict:
         # Fallback: try direct access
         constraint_percentages = summary.get('constraint_percentages', {})
     
+    # Fixed key set and order, so variations line up with the baseline
+    if constraint_percentages:
+        constraint_percentages = {name: constraint_percentages.get(name, 0.0)
+                                  for name in _CONSTRAINT_NAMES}
+    
     return {
         'viable_points': n_viable,
         'constraint_dominance': constraint_percentages
@@ -267,17 +321,16 @@ def print_robustness_summary(results: Dict):
     else:
         print("✗ QRNG_tilt bottleneck is FRAGILE: dominance shifts with ±10% variations")
     
-    # Check if ranking changes
-    baseline_ranking = sorted(baseline_dom.items(), key=lambda x: x[1], reverse=True)
+    # Check if ranking changes (top-1 only: max() keeps the first of tied
+    # entries, matching a stable descending sort)
     ranking_stable = True
-    if len(baseline_ranking) > 0:
-        baseline_top = baseline_ranking[0][0]
+    if len(baseline_dom) > 0:
+        baseline_top = max(baseline_dom, key=baseline_dom.get)
         for key, result in results.items():
             if key == 'baseline' or 'note' in result:
                 continue
             dom = result.get('constraint_dominance', {})
-            ranking = sorted(dom.items(), key=lambda x: x[1], reverse=True)
-            if len(ranking) > 0 and ranking[0][0] != baseline_top:  # Top constraint changed
+            if len(dom) > 0 and max(dom, key=dom.get) != baseline_top:  # Top constraint changed
                 ranking_stable = False
                 break
     else:
@@ -309,6 +362,8 @@ def main():
                    help='Maximum allowed BR(H→inv)')
     ap.add_argument('--variation', type=float, default=0.1,
                    help='Bound variation fraction (default 0.1 = +/-10%%)')
+    ap.add_argument('--workers', type=int, default=None,
+                   help='Worker processes for the variation runs (default: CPU count)')
     ap.add_argument('--qrng-json', type=str,
                    default='experiments/grok_qrng/results/lfdr_withinrun/global_summary.json',
                    help='QRNG bounds JSON')
@@ -336,7 +391,7 @@ def main():
     # Load envelope
     envelope_data = None
     if Path(args.envelope).exists():
-        envelope_data = pd.read_csv(args.envelope)
+        envelope_data = load_envelope(Path(args.envelope))
     
     # Run robustness check
     results = run_robustness_check(
@@ -347,7 +402,8 @@ def main():
         Theta_lab=args.Theta_lab,
         br_max=args.br_max,
         use_normalized_slack=True,
-        variation=args.variation
+        variation=args.variation,
+        max_workers=args.workers
     )
     
     # Print summary
@@ -355,7 +411,7 @@ def main():
     
     # Save results
     output_path = Path(args.out_json)
-    output_path.write_text(json.dumps(results, indent=2))
+    write_json(output_path, results)
     print(f"\n✓ Saved results: {output_path}")
     
     return 0
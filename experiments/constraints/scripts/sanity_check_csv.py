@@ -75,8 +75,8 @@ def sanity_check(csv_path: Path):
         print(f"   (Recommendation: all boundary points should be excluded=1)")
     
     # Check monotonicity (lambda should generally increase)
-    lambda_diff = np.diff(df['lambda'].values)
-    decreasing = np.sum(lambda_diff < 0)
+    lambda_values = df['lambda'].to_numpy()
+    decreasing = np.count_nonzero(lambda_values[1:] < lambda_values[:-1])
     if decreasing > len(df) * 0.1:  # More than 10% decreasing
         print(f"⚠️  Lambda has {decreasing} decreasing steps (may indicate calibration issue)")
     else:
@@ -100,29 +100,31 @@ def test_monotonicity():
     # Test sequence of increasing alpha values
     alpha_values = np.logspace(-9, -5, 20)  # 20 points from 1e-9 to 1e-5
     
-    slacks = []
-    for alpha in alpha_values:
-        slack, bound = compute_qrng_tilt_slack(alpha, lambda_m, epsilon_max)
-        slacks.append(slack)
+    slacks, bound = compute_qrng_tilt_slack(alpha_values, lambda_m, epsilon_max)
     
     # Check monotonicity: slack should decrease as alpha increases
-    is_monotonic = all(slacks[i] >= slacks[i+1] for i in range(len(slacks) - 1))
+    violations = np.flatnonzero(np.diff(slacks) > 0)
     
-    if is_monotonic:
+    # The whole curve must also match the analytic slack epsilon_max - |alpha * 1e3|
+    expected = epsilon_max - np.abs(alpha_values * 1e3)
+    mismatches = np.flatnonzero(np.abs(slacks - expected) >= 1e-10)
+    
+    if violations.size == 0 and mismatches.size == 0:
         print(f"✓ Monotonicity test passed")
         print(f"  Tested {len(alpha_values)} alpha values from {alpha_values[0]:.6e} to {alpha_values[-1]:.6e}")
         print(f"  Slack decreases from {slacks[0]:.6e} to {slacks[-1]:.6e}")
         return True
+    elif violations.size == 0:
+        print(f"✗ Monotonicity test failed: slack deviates from epsilon_max - |alpha * 1e3|")
+        for idx in mismatches[:5]:  # Show first 5
+            print(f"    alpha[{idx}] = {alpha_values[idx]:.6e}: slack = {slacks[idx]:.6e} (expected {expected[idx]:.6e})")
+        return False
     else:
         print(f"✗ Monotonicity test failed")
-        # Find violations
-        violations = []
-        for i in range(len(slacks) - 1):
-            if slacks[i] < slacks[i+1]:
-                violations.append((i, alpha_values[i], alpha_values[i+1], slacks[i], slacks[i+1]))
-        print(f"  Found {len(violations)} violations:")
-        for idx, a1, a2, s1, s2 in violations[:5]:  # Show first 5
-            print(f"    alpha[{idx}] = {a1:.6e} (slack={s1:.6e}) < alpha[{idx+1}] = {a2:.6e} (slack={s2:.6e})")
+        print(f"  Found {violations.size} violations:")
+        for idx in violations[:5]:  # Show first 5
+            print(f"    alpha[{idx}] = {alpha_values[idx]:.6e} (slack={slacks[idx]:.6e}) < "
+                  f"alpha[{idx+1}] = {alpha_values[idx+1]:.6e} (slack={slacks[idx+1]:.6e})")
         return False
 
 
@@ -173,22 +175,19 @@ def test_boundary_conditions():
         },
     ]
     
-    all_passed = True
-    for test in tests:
-        slack, bound = compute_qrng_tilt_slack(test['alpha'], lambda_m, epsilon_max)
-        epsilon = test['alpha'] * 1e3
-        viable = slack >= 0
-        
-        # Check epsilon
-        epsilon_ok = abs(epsilon - test['expected_epsilon']) < 1e-10
-        
-        # Check slack (allow small tolerance for floating point)
-        slack_ok = abs(slack - test['expected_slack']) < 1e-10
-        
-        # Check viability
-        viable_ok = viable == test['expected_viable']
-        
-        if epsilon_ok and slack_ok and viable_ok:
+    alphas = np.array([test['alpha'] for test in tests])
+    slacks, bound = compute_qrng_tilt_slack(alphas, lambda_m, epsilon_max)
+    epsilons = alphas * 1e3
+    viables = slacks >= 0
+    
+    # Check epsilon, slack (allow small tolerance for floating point) and viability
+    epsilon_ok = np.abs(epsilons - [test['expected_epsilon'] for test in tests]) < 1e-10
+    slack_ok = np.abs(slacks - [test['expected_slack'] for test in tests]) < 1e-10
+    viable_ok = viables == [test['expected_viable'] for test in tests]
+    passed = epsilon_ok & slack_ok & viable_ok
+    
+    for test, ok, epsilon, slack, viable in zip(tests, passed, epsilons, slacks, viables.tolist()):
+        if ok:
             print(f"✓ {test['name']}")
             print(f"  alpha = {test['alpha']:.6e}, epsilon = {epsilon:.6e}, slack = {slack:.6e}, viable = {viable}")
         else:
@@ -196,9 +195,8 @@ def test_boundary_conditions():
             print(f"  alpha = {test['alpha']:.6e}, epsilon = {epsilon:.6e} (expected {test['expected_epsilon']:.6e})")
             print(f"  slack = {slack:.6e} (expected {test['expected_slack']:.6e})")
             print(f"  viable = {viable} (expected {test['expected_viable']})")
-            all_passed = False
     
-    return all_passed
+    return bool(passed.all())
 
 
 def test_units_consistency():
@@ -243,26 +241,24 @@ def test_normalized_slack():
         (1.5 * epsilon_max / 1e3, "alpha = 1.5 * epsilon_max / 1e3"),
     ]
     
-    all_passed = True
-    for alpha, description in test_cases:
-        slack, bound = compute_qrng_tilt_slack(alpha, lambda_m, epsilon_max)
-        normalized_slack = slack / bound if bound > 0 else slack
-        
-        # Expected normalized slack
-        epsilon = alpha * 1e3
-        expected_normalized = (epsilon_max - abs(epsilon)) / epsilon_max
-        
-        if abs(normalized_slack - expected_normalized) < 1e-10:
+    alphas = np.array([alpha for alpha, _ in test_cases])
+    slacks, bound = compute_qrng_tilt_slack(alphas, lambda_m, epsilon_max)
+    normalized_slacks = slacks / bound if bound > 0 else slacks
+    
+    # Expected normalized slack
+    expected_normalized = (epsilon_max - np.abs(alphas * 1e3)) / epsilon_max
+    passed = np.abs(normalized_slacks - expected_normalized) < 1e-10
+    
+    for (alpha, description), ok, slack, normalized_slack, expected in zip(
+            test_cases, passed, slacks, normalized_slacks, expected_normalized):
+        if ok:
             print(f"✓ {description}")
-            print(f"  slack = {slack:.6e}, bound = {bound:.6e}")
-            print(f"  normalized_slack = {normalized_slack:.6e} (expected {expected_normalized:.6e})")
         else:
             print(f"✗ {description}")
-            print(f"  slack = {slack:.6e}, bound = {bound:.6e}")
-            print(f"  normalized_slack = {normalized_slack:.6e} (expected {expected_normalized:.6e})")
-            all_passed = False
+        print(f"  slack = {slack:.6e}, bound = {bound:.6e}")
+        print(f"  normalized_slack = {normalized_slack:.6e} (expected {expected:.6e})")
     
-    return all_passed
+    return bool(passed.all())
 
 
 def main():
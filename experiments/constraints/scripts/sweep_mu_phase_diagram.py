@@ -8,53 +8,86 @@ and where Higgs_inv / Fifth_force become active as μ_sb suppression changes.
 Plot: x = log10(mu_sb/m_h), y = log10(theta), color = dominant constraint
 """
 import argparse
-import json
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Headless: figures are only saved to files
 import matplotlib.pyplot as plt
 from matplotlib.colors import ListedColormap
-from collections import Counter
 import sys
 
+
 # Add scripts directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 from derive_alpha_from_portal import map_parameters_to_yukawa
-from check_overlap_derived_alpha import load_constraint_bounds, compute_viable_region_derived_alpha
+from check_overlap_derived_alpha import (
+    load_constraint_bounds, compute_viable_region_derived_alpha, derive_yukawa_grid
+)
 from active_constraint_labeling import CONSTRAINT_LABELS
+from make_global_constraints import write_json
+
+M_H = 125.0  # Higgs mass in GeV
+
+# Column of each constraint in stacked slack arrays (label index)
+_CONSTRAINT_COLUMNS = {name: idx for idx, name in CONSTRAINT_LABELS.items() if idx >= 0}
+
+# (constraint, line style, color) for the dominance panel, in plotting order
+_DOMINANCE_SERIES = (
+    ('QRNG_tilt', 'o-', '#ff7f0e'),
+    ('ATLAS_mu', 's-', '#1f77b4'),
+    ('Higgs_inv', '^-', '#2ca02c'),
+    ('Fifth_force', 'v-', '#d62728'),
+)
 
 
 def print_dominance_diagnostic(
     mu_sb_ratio: float,
     percentages: Dict[str, float],
-    norm_slacks: Dict[str, np.ndarray],
+    norm_slacks: Union[np.ndarray, Dict[str, np.ndarray]],
     n_viable: int
 ):
     """
     Print compact dominance diagnostic block for a given μ_sb value.
     
+    norm_slacks is either a stacked (n_points, n_constraints) array with columns
+    in CONSTRAINT_LABELS order (as returned by label_constraints_for_grid,
+    restricted to viable points) or a dict of per-constraint arrays.
+    
     Format:
     μ_sb/m_h = 1e-2
     dominant fractions: QRNG_tilt 78%, ATLAS_mu 12%, Higgs_inv 8%, Fifth_force 2%
     median normalized slack (top3): QRNG_tilt 0.91, ATLAS_mu 0.94, Higgs_inv 0.97
     """
-    # Sort constraints by percentage
-    sorted_constraints = sorted(percentages.items(), key=lambda x: x[1], reverse=True)
+    # Top-4 constraints by percentage (same order as a stable descending sort)
+    top4 = heapq.nlargest(4, percentages.items(), key=lambda x: x[1])
     
     # Format fractions
-    frac_str = ", ".join([f"{name} {pct:.1f}%" for name, pct in sorted_constraints[:4]])
+    frac_str = ", ".join([f"{name} {pct:.1f}%" for name, pct in top4])
     
     # Compute median normalized slack for top-3
-    top3_names = [name for name, _ in sorted_constraints[:3]]
+    top3_names = [name for name, _ in top4[:3]]
     median_slacks = []
-    for name in top3_names:
-        if name in norm_slacks and isinstance(norm_slacks[name], np.ndarray):
-            arr = norm_slacks[name]
-            if arr.size > 0:
-                median_slack = float(np.median(arr))
-                median_slacks.append(f"{name} {median_slack:.3f}")
+    if isinstance(norm_slacks, np.ndarray):
+        if norm_slacks.size > 0:
+            # All column medians in one pass over the stacked array
+            medians = np.median(norm_slacks.reshape(-1, norm_slacks.shape[-1]), axis=0)
+            for name in top3_names:
+                if name in _CONSTRAINT_COLUMNS:
+                    median_slacks.append(f"{name} {medians[_CONSTRAINT_COLUMNS[name]]:.3f}")
+    else:
+        for name in top3_names:
+            if name in norm_slacks and isinstance(norm_slacks[name], np.ndarray):
+                arr = norm_slacks[name]
+                if arr.size > 0:
+                    median_slack = float(np.median(arr))
+                    median_slacks.append(f"{name} {median_slack:.3f}")
     
     median_str = ", ".join(median_slacks) if median_slacks else "N/A"
     
@@ -65,6 +98,93 @@ def print_dominance_diagnostic(
         print(f"  median normalized slack (top3): {median_str}")
 
 
+# Per-process copy of the sweep's shared arguments (envelope, base grids, bounds),
+# set once by _init_worker so they are not re-pickled with every μ_sb task
+_worker_shared = None
+
+
+def _init_worker(shared: Dict):
+    """Store the sweep's shared arguments in a pool worker."""
+    global _worker_shared
+    _worker_shared = shared
+
+
+def _scan_one_mu_sb_in_worker(item: Tuple[int, float, float]) -> Dict:
+    """Pool entry point: scan one μ_sb against the worker's shared arguments."""
+    return _scan_one_mu_sb(item, _worker_shared)
+
+
+def _scan_one_mu_sb(item: Tuple[int, float, float], shared: Dict) -> Dict:
+    """
+    Run the (m_φ, θ) scan for one μ_sb value (top-level so it pickles for worker processes).
+    
+    Args:
+        item: (index, mu_sb, log10(mu_sb/m_h)) with mu_sb in GeV
+        shared: Arguments common to every μ_sb (grid, bounds, envelope, ...)
+    
+    Returns:
+        Result row for this μ_sb
+    """
+    i, mu_sb, log10_mu_sb_ratio = item
+    mu_sb_ratio = mu_sb / M_H
+    print(f"[{i+1}/{shared['n_mu_sb']}] μ_sb/m_h = {mu_sb_ratio:.4e} (μ_sb = {mu_sb:.3e} GeV)")
+    
+    # The normalized model's μ_sb dependence is an overall (μ_sb/m_h)^4 factor
+    # on α, so only that multiplier is applied to the shared unsuppressed grid
+    M_PHI_GRID, THETA_GRID, LAMBDA_GRID, alpha_unsuppressed = shared['base_grids']
+    with np.errstate(over='ignore', invalid='ignore'):
+        ALPHA_GRID = alpha_unsuppressed * (mu_sb / M_H)**4
+    bad = ~np.isfinite(ALPHA_GRID)
+    if bad.any():
+        LAMBDA_GRID = np.where(bad, np.nan, LAMBDA_GRID)
+        ALPHA_GRID[bad] = np.nan
+    
+    # For each mu_sb, run parameter scan
+    summary = compute_viable_region_derived_alpha(
+        qrng_bounds=shared['qrng_bounds'],
+        ff_bounds=shared['ff_bounds'],
+        higgs_bounds=shared['higgs_bounds'],
+        envelope_data=shared['envelope_data'],
+        model='normalized',
+        Theta_lab=shared['Theta_lab'],
+        br_max=shared['br_max'],
+        use_normalized_slack=True,
+        mu_sb=mu_sb,
+        output_dir=None,  # Don't save individual outputs
+        grids=(M_PHI_GRID, THETA_GRID, LAMBDA_GRID, ALPHA_GRID),
+        **shared['grid']
+    )
+    
+    if summary.get('viable_region_exists', True):
+        n_viable = summary.get('n_viable_points', 0)
+        constraint_dom = summary.get('constraint_dominance', {})
+        if isinstance(constraint_dom, dict) and 'percentages' in constraint_dom:
+            percentages = constraint_dom['percentages']
+        else:
+            percentages = summary.get('constraint_percentages', {})
+        
+        # Extract normalized slacks if available (for diagnostic block)
+        norm_slacks = summary.get('normalized_slacks', {})
+        
+        # Print dominance diagnostic block
+        print_dominance_diagnostic(mu_sb_ratio, percentages, norm_slacks, n_viable)
+        
+        return {
+            'mu_sb': float(mu_sb),
+            'mu_sb_ratio': float(mu_sb_ratio),
+            'log10_mu_sb_ratio': float(log10_mu_sb_ratio),
+            'n_viable': n_viable,
+            'constraint_dominance': percentages
+        }
+    return {
+        'mu_sb': float(mu_sb),
+        'mu_sb_ratio': float(mu_sb_ratio),
+        'log10_mu_sb_ratio': float(log10_mu_sb_ratio),
+        'n_viable': 0,
+        'constraint_dominance': {}
+    }
+
+
 def sweep_mu_phase_diagram(
     m_phi_min: float, m_phi_max: float, n_m_phi: int,
     theta_min: float, theta_max: float, n_theta: int,
@@ -78,7 +198,8 @@ def sweep_mu_phase_diagram(
     Theta_lab: float = 1.0,
     br_max: float = 0.145,
     epsilon_max: Optional[float] = None,  # Override QRNG epsilon_max
-    output_dir: Path = None
+    output_dir: Path = None,
+    max_workers: Optional[int] = None
 ) -> Dict:
     """
     Sweep μ_sb parameter and compute dominance at each point.
@@ -96,12 +217,12 @@ def sweep_mu_phase_diagram(
         Theta_lab: Screening factor for lab experiments
         br_max: Maximum allowed BR(H→inv)
         output_dir: Output directory
+        max_workers: Worker processes for the μ_sb scans (default: os.cpu_count();
+            1 runs them in-process)
     
     Returns:
         Dictionary with sweep results
     """
-    M_H = 125.0  # Higgs mass in GeV
-    
     # Create mu_sb grid (in units of m_h)
     mu_sb_ratios = np.logspace(
         np.log10(mu_sb_min_ratio),
@@ -109,72 +230,44 @@ def sweep_mu_phase_diagram(
         n_mu_sb
     )
     mu_sb_values = mu_sb_ratios * M_H  # Convert to GeV
+    # log10(μ_sb/m_h) for every scan, from the same μ_sb/m_h the scans report
+    log10_mu_sb_ratios = np.log10(mu_sb_values / M_H)
     
     # Create m_phi and theta grids
     m_phi_range = np.logspace(np.log10(m_phi_min), np.log10(m_phi_max), n_m_phi)
     theta_range = np.logspace(np.log10(theta_min), np.log10(theta_max), n_theta)
     
-    # Storage for results
-    results = []
-    
     print(f"Sweeping {n_mu_sb} μ_sb values × {n_m_phi} m_φ × {n_theta} θ = {n_mu_sb * n_m_phi * n_theta:,} points")
     print(f"μ_sb range: {mu_sb_min_ratio:.2e} to {mu_sb_max_ratio:.2e} × m_h")
     print()
     
-    # Sweep mu_sb
-    for i, mu_sb in enumerate(mu_sb_values):
-        mu_sb_ratio = mu_sb / M_H
-        print(f"[{i+1}/{n_mu_sb}] μ_sb/m_h = {mu_sb_ratio:.4e} (μ_sb = {mu_sb:.3e} GeV)")
-        
-        # Override qrng_bounds epsilon_max if provided
-        qrng_bounds_override = dict(qrng_bounds) if qrng_bounds else {}
-        if epsilon_max is not None:
-            qrng_bounds_override['epsilon_upper_95'] = epsilon_max
-            qrng_bounds_override['epsilon_max'] = epsilon_max
-        
-        # For each mu_sb, run parameter scan
-        summary = compute_viable_region_derived_alpha(
-            m_phi_min, m_phi_max, n_m_phi,
-            theta_min, theta_max, n_theta,
-            qrng_bounds_override, ff_bounds, higgs_bounds,
-            envelope_data,
-            model='normalized',
-            Theta_lab=Theta_lab,
-            br_max=br_max,
-            use_normalized_slack=True,
-            mu_sb=mu_sb,
-            output_dir=None  # Don't save individual outputs
-        )
-        
-        if summary.get('viable_region_exists', True):
-            n_viable = summary.get('n_viable_points', 0)
-            constraint_dom = summary.get('constraint_dominance', {})
-            if isinstance(constraint_dom, dict) and 'percentages' in constraint_dom:
-                percentages = constraint_dom['percentages']
-            else:
-                percentages = summary.get('constraint_percentages', {})
-            
-            # Extract normalized slacks if available (for diagnostic block)
-            norm_slacks = summary.get('normalized_slacks', {})
-            
-            # Print dominance diagnostic block
-            print_dominance_diagnostic(mu_sb_ratio, percentages, norm_slacks, n_viable)
-            
-            results.append({
-                'mu_sb': float(mu_sb),
-                'mu_sb_ratio': float(mu_sb_ratio),
-                'log10_mu_sb_ratio': float(np.log10(mu_sb_ratio)),
-                'n_viable': n_viable,
-                'constraint_dominance': percentages
-            })
-        else:
-            results.append({
-                'mu_sb': float(mu_sb),
-                'mu_sb_ratio': float(mu_sb_ratio),
-                'log10_mu_sb_ratio': float(np.log10(mu_sb_ratio)),
-                'n_viable': 0,
-                'constraint_dominance': {}
-            })
+    # Every μ_sb scan is independent: same grid and bounds, different suppression
+    # Override qrng_bounds epsilon_max if provided (same for every μ_sb)
+    qrng_bounds_override = dict(qrng_bounds) if qrng_bounds else {}
+    if epsilon_max is not None:
+        qrng_bounds_override['epsilon_upper_95'] = epsilon_max
+        qrng_bounds_override['epsilon_max'] = epsilon_max
+    
+    grid = dict(m_phi_min=m_phi_min, m_phi_max=m_phi_max, n_m_phi=n_m_phi,
+                theta_min=theta_min, theta_max=theta_max, n_theta=n_theta)
+    shared = dict(
+        grid=grid,
+        # (m_φ, θ, λ, α) without scale-breaking suppression, derived once
+        base_grids=derive_yukawa_grid(**grid, model='normalized'),
+        n_mu_sb=n_mu_sb,
+        qrng_bounds=qrng_bounds_override, ff_bounds=ff_bounds, higgs_bounds=higgs_bounds,
+        envelope_data=envelope_data,
+        Theta_lab=Theta_lab,
+        br_max=br_max
+    )
+    items = list(zip(range(n_mu_sb), mu_sb_values, log10_mu_sb_ratios))
+    n_workers = min(n_mu_sb, max_workers or os.cpu_count() or 1)
+    if n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                 initargs=(shared,)) as ex:
+            results = list(ex.map(_scan_one_mu_sb_in_worker, items))
+    else:
+        results = list(map(_scan_one_mu_sb, items, repeat(shared)))
     
     # Create phase diagram plot
     if output_dir:
@@ -213,7 +306,7 @@ def sweep_mu_phase_diagram(
     
     if output_dir:
         json_path = output_dir / 'MU_PHASE_DIAGRAM.json'
-        json_path.write_text(json.dumps(sweep_results, indent=2))
+        write_json(json_path, sweep_results)
         print(f"✓ Saved results: {json_path}")
     
     return sweep_results
@@ -237,27 +330,18 @@ def plot_mu_phase_diagram(results: List[Dict], m_phi_range: np.ndarray,
     log10_mu_sb_ratios = [r['log10_mu_sb_ratio'] for r in results]
     n_viable = [r['n_viable'] for r in results]
     
-    # Extract dominance percentages
-    qrng_pct = []
-    atlas_pct = []
-    higgs_pct = []
-    ff_pct = []
-    
-    for r in results:
-        dom = r.get('constraint_dominance', {})
-        qrng_pct.append(dom.get('QRNG_tilt', 0.0))
-        atlas_pct.append(dom.get('ATLAS_mu', 0.0))
-        higgs_pct.append(dom.get('Higgs_inv', 0.0))
-        ff_pct.append(dom.get('Fifth_force', 0.0))
+    # Dominance percentages, one column per plotted constraint
+    pct = np.array([
+        [r.get('constraint_dominance', {}).get(name, 0.0) for name, _, _ in _DOMINANCE_SERIES]
+        for r in results
+    ]).reshape(len(results), len(_DOMINANCE_SERIES))
     
     # Create figure with two panels
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
     
     # Panel 1: Dominance percentages vs mu_sb
-    ax1.plot(log10_mu_sb_ratios, qrng_pct, 'o-', label='QRNG_tilt', color='#ff7f0e', linewidth=2, markersize=6)
-    ax1.plot(log10_mu_sb_ratios, atlas_pct, 's-', label='ATLAS_mu', color='#1f77b4', linewidth=2, markersize=6)
-    ax1.plot(log10_mu_sb_ratios, higgs_pct, '^-', label='Higgs_inv', color='#2ca02c', linewidth=2, markersize=6)
-    ax1.plot(log10_mu_sb_ratios, ff_pct, 'v-', label='Fifth_force', color='#d62728', linewidth=2, markersize=6)
+    for k, (name, style, color) in enumerate(_DOMINANCE_SERIES):
+        ax1.plot(log10_mu_sb_ratios, pct[:, k], style, label=name, color=color, linewidth=2, markersize=6)
     
     ax1.set_xlabel('log₁₀(μ_sb / m_h)', fontsize=12)
     ax1.set_ylabel('Dominance Percentage (%)', fontsize=12)
@@ -287,7 +371,7 @@ def plot_mu_phase_diagram(results: List[Dict], m_phi_range: np.ndarray,
 def create_phase_diagram_interpretation(results: List[Dict], output_dir: Path, epsilon_max: Optional[float] = None):
     """Create markdown interpretation of phase diagram results."""
     import datetime
-    md_content = f"""# μ_sb Phase Diagram Interpretation
+    parts = [f"""# μ_sb Phase Diagram Interpretation
 
 ## Date
 {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
@@ -305,46 +389,43 @@ This is the "one figure to rule them all" - shows where bottlenecks switch and w
 
 ### Dominance Transitions
 
-"""
-    
-    # Find transition points
-    prev_dominant = None
-    transitions = []
-    
-    for i, r in enumerate(results):
-        dom = r.get('constraint_dominance', {})
-        if dom:
-            # Find dominant constraint
-            dominant = max(dom.items(), key=lambda x: x[1])[0] if dom else None
-            
-            if prev_dominant is not None and dominant != prev_dominant:
-                transitions.append({
-                    'mu_sb_ratio': r['mu_sb_ratio'],
-                    'log10_mu_sb_ratio': r['log10_mu_sb_ratio'],
-                    'from': prev_dominant,
-                    'to': dominant
-                })
-            prev_dominant = dominant
+"""]
+    
+    # Find transition points: changes of the dominant constraint between
+    # consecutive μ_sb values that have any viable points
+    ranked = [r for r in results if r.get('constraint_dominance')]
+    dominants = np.array([max(r['constraint_dominance'].items(), key=lambda x: x[1])[0]
+                          for r in ranked], dtype=object)
+    change_idx = np.flatnonzero(dominants[1:] != dominants[:-1]) + 1
+    transitions = [
+        {
+            'mu_sb_ratio': ranked[k]['mu_sb_ratio'],
+            'log10_mu_sb_ratio': ranked[k]['log10_mu_sb_ratio'],
+            'from': dominants[k - 1],
+            'to': dominants[k]
+        }
+        for k in change_idx
+    ]
     
     if transitions:
-        md_content += "**Dominance Transitions:**\n\n"
+        parts.append("**Dominance Transitions:**\n\n")
         for t in transitions:
-            md_content += f"- At μ_sb/m_h = {t['mu_sb_ratio']:.4e} (log₁₀ = {t['log10_mu_sb_ratio']:.2f}): "
-            md_content += f"{t['from']} → {t['to']}\n"
-        md_content += "\n"
+            parts.append(f"- At μ_sb/m_h = {t['mu_sb_ratio']:.4e} (log₁₀ = {t['log10_mu_sb_ratio']:.2f}): ")
+            parts.append(f"{t['from']} → {t['to']}\n")
+        parts.append("\n")
     
     # Summary table
-    md_content += "### Summary Table\n\n"
-    md_content += "| μ_sb/m_h | log₁₀(μ_sb/m_h) | Viable Points | QRNG_tilt (%) | ATLAS_mu (%) | Higgs_inv (%) | Fifth_force (%) |\n"
-    md_content += "|----------|-----------------|---------------|---------------|--------------|----------------|-----------------|\n"
+    parts.append("### Summary Table\n\n")
+    parts.append("| μ_sb/m_h | log₁₀(μ_sb/m_h) | Viable Points | QRNG_tilt (%) | ATLAS_mu (%) | Higgs_inv (%) | Fifth_force (%) |\n")
+    parts.append("|----------|-----------------|---------------|---------------|--------------|----------------|-----------------|\n")
     
     for r in results[::max(1, len(results)//10)]:  # Sample every 10th point
         dom = r.get('constraint_dominance', {})
-        md_content += f"| {r['mu_sb_ratio']:.4e} | {r['log10_mu_sb_ratio']:.2f} | {r['n_viable']:,} | "
-        md_content += f"{dom.get('QRNG_tilt', 0.0):.1f} | {dom.get('ATLAS_mu', 0.0):.1f} | "
-        md_content += f"{dom.get('Higgs_inv', 0.0):.1f} | {dom.get('Fifth_force', 0.0):.1f} |\n"
+        parts.append(f"| {r['mu_sb_ratio']:.4e} | {r['log10_mu_sb_ratio']:.2f} | {r['n_viable']:,} | ")
+        parts.append(f"{dom.get('QRNG_tilt', 0.0):.1f} | {dom.get('ATLAS_mu', 0.0):.1f} | ")
+        parts.append(f"{dom.get('Higgs_inv', 0.0):.1f} | {dom.get('Fifth_force', 0.0):.1f} |\n")
     
-    md_content += f"""
+    parts.append(f"""
 
 ## Interpretation
 
@@ -376,10 +457,10 @@ This is the "one figure to rule them all" - shows where bottlenecks switch and w
 - Use this phase diagram to decide which experiment to pre-register
 - If QRNG_tilt remains dominant across μ_sb range → focus on QRNG calibration
 - If collider constraints become judge → focus on LHC Run 3 data
-"""
+""")
     
     md_path = output_dir / 'MU_PHASE_DIAGRAM.md'
-    md_path.write_text(md_content)
+    md_path.write_text("".join(parts))
     print(f"✓ Saved interpretation: {md_path}")
 
 
@@ -427,6 +508,8 @@ def main():
     ap.add_argument('--out-dir', type=str,
                    default='experiments/constraints/results',
                    help='Output directory')
+    ap.add_argument('--workers', type=int, default=None,
+                   help='Worker processes for the μ_sb scans (default: CPU count)')
     args = ap.parse_args()
     
     # Adjust m_phi range based on lambda-regime if specified
@@ -465,7 +548,8 @@ def main():
         Theta_lab=args.Theta_lab,
         br_max=args.br_max,
         epsilon_max=args.epsilon_max,
-        output_dir=Path(args.out_dir)
+        output_dir=Path(args.out_dir),
+        max_workers=args.workers
     )
     
     print("\n" + "="*60)
@@ -0,0 +1,64 @@
+"""
+Test grid constraint labeling against the per-constraint slack helpers.
+
+Locks that label_constraints_for_grid stacks the compute_*_slack results in
+CONSTRAINT_LABELS order (ATLAS_mu, Higgs_inv, Fifth_force, QRNG_tilt) and that
+the array helpers agree with scalar calls.
+"""
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+scripts_dir = Path(__file__).parent.parent / "experiments" / "constraints" / "scripts"
+sys.path.insert(0, str(scripts_dir))
+
+from active_constraint_labeling import (
+    compute_atlas_mu_slack,
+    compute_fifth_force_slack,
+    compute_higgs_inv_slack,
+    compute_qrng_tilt_slack,
+    label_constraints_for_grid,
+)
+
+
+@pytest.mark.parametrize("use_normalized_slack", [True, False])
+def test_grid_labels_match_scalar_helpers(use_normalized_slack: bool) -> None:
+    """Test that every grid cell matches scalar helper calls at that point."""
+    rng = np.random.default_rng(0)
+    alpha = 10 ** rng.uniform(-12, -2, (12, 9))
+    alpha[0, 0] = -1e-7  # Negative branch of the ATLAS μ slack
+    lambda_m = 10 ** rng.uniform(-16, -3, (12, 9))
+    m_phi = 10 ** rng.uniform(-3, 3, (12, 9))  # Both sides of m_H/2
+    kwargs = dict(alpha_max_allowed=1e-5, epsilon_max=0.002292, Theta_lab=0.3, br_max=0.107)
+
+    labels, slacks = label_constraints_for_grid(
+        lambda_m, alpha, m_phi_grid=m_phi,
+        use_normalized_slack=use_normalized_slack, **kwargs
+    )
+    assert labels.shape == alpha.shape
+    assert slacks.shape == alpha.shape + (4,)
+
+    for idx in np.ndindex(alpha.shape):
+        a, lam, m = alpha[idx], lambda_m[idx], m_phi[idx]
+        point = [
+            compute_atlas_mu_slack(a, lam),
+            compute_higgs_inv_slack(a, lam, m, br_max=kwargs["br_max"]),
+            compute_fifth_force_slack(a, lam, alpha_max_allowed=kwargs["alpha_max_allowed"],
+                                      Theta_lab=kwargs["Theta_lab"]),
+            compute_qrng_tilt_slack(a, lam, epsilon_max=kwargs["epsilon_max"]),
+        ]
+        expected = np.array([s / b if use_normalized_slack else s for s, b in point])
+        np.testing.assert_allclose(slacks[idx], expected, rtol=1e-15, atol=0.0)
+
+        expected_label = int(np.argmin(expected)) if np.all(expected > 0) else -1
+        assert labels[idx] == expected_label
+
+
+def test_higgs_phase_space_closes_above_half_higgs_mass() -> None:
+    """Test that the array Higgs slack drops BR(H→inv) only for m_φ ≥ 62.5 GeV."""
+    alpha = np.full(3, 0.5)
+    slack, bound = compute_higgs_inv_slack(alpha, 1.0, np.array([10.0, 62.5, 100.0]))
+    assert bound == 0.145
+    np.testing.assert_array_equal(slack, [0.145 - 0.05, 0.145, 0.145])
@@ -0,0 +1,37 @@
+"""
+Test the repeated-array percentile used by separable island summaries.
+
+repeated_percentile must equal np.percentile on the materialized repeated
+array (numpy 'linear' method), bit for bit, for any length, repeat count
+and percentile.
+"""
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+scripts_dir = Path(__file__).parent.parent / "experiments" / "constraints" / "scripts"
+sys.path.insert(0, str(scripts_dir))
+
+from check_overlap_region import repeated_percentile
+
+
+def test_repeated_percentile_matches_np_percentile() -> None:
+    """Test random (values, repeats, q) cases against np.percentile(np.repeat(...))."""
+    rng = np.random.default_rng(0)
+    for _ in range(5000):
+        n = int(rng.integers(1, 40))
+        repeats = int(rng.integers(1, 60))
+        # Log-uniform values over many decades, like the λ/α grid axes
+        vals = np.sort(10 ** rng.uniform(-20, 2, n))
+        q = float(rng.choice([0.0, 5.0, 50.0, 95.0, 100.0, rng.uniform(0, 100)]))
+        expected = np.percentile(np.repeat(vals, repeats), q)
+        assert repeated_percentile(vals, repeats, q) == expected, (n, repeats, q)
+
+
+@pytest.mark.parametrize("q", [0, 5, 50, 95, 100])
+def test_repeated_percentile_single_value(q: float) -> None:
+    """Test that a single repeated value is its own percentile."""
+    vals = np.array([3.5e-9])
+    assert repeated_percentile(vals, 7, q) == 3.5e-9
@@ -0,0 +1,63 @@
+"""
+Test the log-space interpolation used on every overlap path.
+
+interp_log_linear must reproduce scipy's
+interp1d(kind='linear', bounds_error=False, fill_value='extrapolate'):
+inside the curve, past both ends, and on curves with repeated λ.
+"""
+import numpy as np
+import pytest
+import sys
+from pathlib import Path
+from scipy.interpolate import interp1d
+
+# Add scripts directory to path
+scripts_dir = Path(__file__).parent.parent / "experiments" / "constraints" / "scripts"
+sys.path.insert(0, str(scripts_dir))
+
+from diagnose_constraint_overlap import interp_log_linear
+
+
+def _reference(log_x: np.ndarray, log_y: np.ndarray, log_x_req: np.ndarray,
+               **kwargs) -> np.ndarray:
+    f = interp1d(log_x, log_y, kind='linear', bounds_error=False,
+                 fill_value='extrapolate', **kwargs)
+    return f(log_x_req)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_interp1d_in_range_and_both_extrapolation_sides(seed: int) -> None:
+    """Test queries inside the curve, on its knots, and beyond both ends."""
+    rng = np.random.default_rng(seed)
+    log_x = np.sort(rng.uniform(-6, 0, 25))
+    log_y = rng.uniform(-10, 2, 25)
+    log_x_req = np.concatenate([
+        rng.uniform(log_x[0], log_x[-1], 200),   # in range
+        log_x,                                    # exactly on knots
+        rng.uniform(log_x[0] - 3, log_x[0], 50),  # below the first λ
+        rng.uniform(log_x[-1], log_x[-1] + 3, 50),  # above the last λ
+    ])
+    np.testing.assert_array_equal(interp_log_linear(log_x, log_y, log_x_req),
+                                  _reference(log_x, log_y, log_x_req))
+
+
+def test_matches_interp1d_with_repeated_lambda() -> None:
+    """Test a sorted curve with repeated λ knots (as constraint curves can have)."""
+    log_x = np.array([-6.0, -5.0, -5.0, -4.0, -3.0, -3.0, -3.0, -2.0])
+    log_y = np.array([1.0, 0.0, -1.0, -2.0, -1.0, -4.0, -3.0, -5.0])
+    log_x_req = np.array([-7.0, -6.0, -5.5, -5.0, -4.5, -3.0, -2.5, -2.0, -1.0])
+    # The curve is already sorted (constraint_log_alpha_at sorts by λ first),
+    # so interp1d must keep the given order of equal-λ knots
+    np.testing.assert_array_equal(
+        interp_log_linear(log_x, log_y, log_x_req),
+        _reference(log_x, log_y, log_x_req, assume_sorted=True)
+    )
+
+
+def test_two_point_curve_extrapolates_with_its_slope() -> None:
+    """Test the minimal curve: one segment used for every query."""
+    log_x = np.array([0.0, 1.0])
+    log_y = np.array([2.0, 4.0])
+    log_x_req = np.array([-1.0, 0.5, 3.0])
+    np.testing.assert_array_equal(interp_log_linear(log_x, log_y, log_x_req),
+                                  [0.0, 3.0, 8.0])
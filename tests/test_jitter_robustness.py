@@ -0,0 +1,54 @@
+"""
+Test the batched fifth-force jitter against per-run jitter_alpha calls.
+
+jitter_alpha_max_allowed draws all runs' noise as one matrix and takes the
+minimum in log space; it must give the same α_max_allowed as running
+jitter_alpha once per run on the same Generator and taking the minimum
+jittered α over the excluded rows.
+"""
+import numpy as np
+import pandas as pd
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+scripts_dir = Path(__file__).parent.parent / "experiments" / "constraints" / "scripts"
+sys.path.insert(0, str(scripts_dir))
+
+from jitter_robustness_test import jitter_alpha, jitter_alpha_max_allowed
+
+
+def _envelope(rng: np.random.Generator, n_rows: int = 60) -> pd.DataFrame:
+    """Synthetic envelope with a mix of excluded and allowed rows."""
+    return pd.DataFrame({
+        'lambda': np.logspace(-6, 0, n_rows),
+        'alpha': 10 ** rng.uniform(-8, 2, n_rows),
+        'excluded': (rng.random(n_rows) < 0.6).astype(np.int8),
+    })
+
+
+def test_batched_min_matches_per_run_min() -> None:
+    """Test that the batched jitter equals a direct per-run minimum (seeded)."""
+    envelope = _envelope(np.random.default_rng(1))
+    excluded = envelope['excluded'].to_numpy() == 1
+    n_runs, sigma = 200, 0.1
+
+    batched = jitter_alpha_max_allowed(envelope, n_runs, sigma=sigma,
+                                       rng=np.random.default_rng(42))
+
+    rng = np.random.default_rng(42)
+    direct = np.array([
+        jitter_alpha(envelope['alpha'].to_numpy(), sigma=sigma, rng=rng)[excluded].min()
+        for _ in range(n_runs)
+    ])
+
+    assert batched.shape == (n_runs,)
+    np.testing.assert_allclose(batched, direct, rtol=1e-15, atol=0.0)
+
+
+def test_no_excluded_rows_gives_nan() -> None:
+    """Test that an envelope with nothing excluded yields NaN for every run."""
+    envelope = _envelope(np.random.default_rng(2))
+    envelope['excluded'] = 0
+    result = jitter_alpha_max_allowed(envelope, 5, rng=np.random.default_rng(0))
+    assert np.isnan(result).all()